@@ -1,5 +1,13 @@
 """smartvns package entry point."""
 
-from . import cli, config, vnsconnect
+import importlib
 
 __all__ = ["cli", "vnsconnect", "config"]
+
+
+def __getattr__(name):
+    # Submodules are imported on first access so that e.g. the CLI does not
+    # pull in Bleak through `vnsconnect` when `smartvns` is imported.
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,21 @@ Expose the programmatic API submodules. Importing this package should be
 lightweight and must not import or execute CLI parsing code; the CLI is
 only reachable via `python -m smartvns-cli.usb_ctrl` (which runs
 `__main__.py`) or by importing a separate `cli` module.
+
+The ``routines`` and ``fragments`` submodules pull in smpclient and the
+generated protobuf code, so they are only imported on first attribute access.
 """
 
-from . import routines, fragments
+import importlib
+
 from ._cli import list_ports, set_datetime, get_battery, get_fw_version, get_config, set_config, reboot, factory_reset, dfu, pair, unpair
 
 __all__ = ["routines", "fragments", "list_ports", "set_datetime", "get_battery", "get_fw_version", "get_config", "set_config", "reboot", "factory_reset", "dfu", "pair", "unpair"]
+
+_LAZY_SUBMODULES = ("routines", "fragments")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
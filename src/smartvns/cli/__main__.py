@@ -1,6 +1,6 @@
-"""Execute the usb_ctrl Typer app when the package is run with -m.
+"""Execute the CLI dispatcher when the package is run with -m.
 
-This allows: python -m smartvns_cli.usb_ctrl --help
+This allows: python -m smartvns.cli --help
 """
 from ._cli import app
 
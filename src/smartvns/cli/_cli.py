@@ -1,132 +1,378 @@
-import asyncio
+import argparse
+import functools
 from pathlib import Path
-from typing import List, Union, Annotated
+from typing import List, Optional, Sequence
 from enum import Enum
 
-import typer
-import rich
-from serial.tools import list_ports as lports
-from google.protobuf.json_format import MessageToJson, MessageToDict, Parse
+# Heavy dependencies (rich, pyserial, protobuf, smpclient and the routines
+# built on top of them) are imported inside the commands that use them so
+# that `--help` and argument errors do not pay their import cost.
 
-from smartvns.config import SysConfig, StimConfig
-from . import routines
+_runner = None
 
-app = typer.Typer()
 
-# create subcommand groups for get and set to organize device queries/commands
-get_app = typer.Typer()
-set_app = typer.Typer()
+class _Runner:
+    """Minimal ``asyncio.Runner`` for Python < 3.11."""
+
+    def __init__(self):
+        import asyncio
+
+        self._loop = asyncio.new_event_loop()
+
+    def run(self, coro):
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        try:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        finally:
+            self._loop.close()
+
+
+def _run(coro):
+    """Run CORO to completion on the CLI's event loop.
+
+    The loop is created on first use and reused for the rest of the process,
+    so routines fanning out over several ports, and commands run one after
+    another from Python (e.g. ``app([...])`` in a script), share a single
+    loop. It is shut down at interpreter exit.
+    """
+    global _runner
+    if _runner is None:
+        import asyncio
+        import atexit
+
+        _runner = asyncio.Runner() if hasattr(asyncio, "Runner") else _Runner()
+        atexit.register(_runner.close)
+    return _runner.run(coro)
+
+
+def _run_routine(name: str, *args):
+    """Run ``routines.<name>(*args)``, in the daemon if one is running."""
+    from . import _daemon
+
+    try:
+        return _daemon.call(name, *args)
+    except _daemon.DaemonUnavailable:
+        pass
+    except RuntimeError as e:
+        from rich import print as rprint
+        rprint(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+    from . import routines
+    return _run(getattr(routines, name)(*args))
+
+
+def _release_ports(ports: Sequence[str]):
+    """Make a running daemon close PORTS before this process opens them."""
+    from . import _daemon
+
+    try:
+        _daemon.release(list(ports))
+    except _daemon.DaemonUnavailable:
+        pass
 
-app.add_typer(get_app, name="get")
-app.add_typer(set_app, name="set")
 
-@app.command("list")
 def list_ports():
     """List available serial ports."""
+    from serial.tools import list_ports as lports
+
     ports = lports.comports()
     for port in ports:
-        typer.echo(f"{port.device}: {port.description}")
+        print(f"{port.device}: {port.description}")
 
 
-@set_app.command("time")
-def set_datetime(ports: Annotated[List[str], typer.Argument()]):
+def set_datetime(ports: List[str]):
     """Set current system time on devices provided in PORTS.
     """
-    asyncio.run(routines.set_time(ports))
+    _run_routine("set_time", ports)
 
 
-@get_app.command("battery")
-def get_battery(ports: Annotated[List[str], typer.Argument()]):
+def get_battery(ports: List[str]):
     """Get battery level from device."""
-    b = asyncio.run(routines.get_battery(ports))
-    rich.print(b)
+    from rich import print as rprint
 
+    b = _run_routine("get_battery", ports)
+    rprint(b)
 
-@get_app.command("version")
-def get_fw_version(ports: Annotated[List[str], typer.Argument()]):
+
+def get_fw_version(ports: List[str]):
     """Get firmware version from device."""
-    v = asyncio.run(routines.get_version(ports))
-    rich.print(v)
+    from rich import print as rprint
+
+    v = _run_routine("get_version", ports)
+    rprint(v)
 
 
 class ConfigType(str, Enum):
     sys = "sys"
     stim = "stim"
 
-@get_app.command("config")
+
+# configuration file formats by file name suffix, shared by get and set config
+_CONFIG_FORMATS = {".json": "json", ".pb": "binary", ".bin": "binary"}
+
+
+def _config_format(file: Path) -> str:
+    """Return the format of the configuration file FILE, exit if unsupported."""
+    fmt = _CONFIG_FORMATS.get(file.suffix.lower())
+    if fmt is None:
+        from rich import print as rprint
+        rprint(f"[red]Unsupported configuration file {file}: "
+               f"use {', '.join(_CONFIG_FORMATS)}[/red]")
+        raise SystemExit(1)
+    return fmt
+
+
 def get_config(cfg_type: ConfigType,
-              port: Annotated[str, typer.Argument()],
-              save: Annotated[Union[Path, None], typer.Option(help="If provided, save configuration to this file.")] = None):
-    cfg = asyncio.run(routines.get_config(port, cfg_type.value))
+               port: str,
+               save: Optional[Path] = None):
+    """Get configuration from device.
+
+    With SAVE, the configuration is also written to that file: as JSON when
+    the file name ends in '.json', as binary protobuf for '.pb' and '.bin'.
+    """
+    cfg_type = ConfigType(cfg_type)
+    if save:
+        save = Path(save)
+    save_format = _config_format(save) if save else None
+
+    from rich import print as rprint
+    from google.protobuf import text_format
+    from . import routines
+
+    _release_ports([port])
+    cfg = _run(routines.get_config(port, cfg_type.value))
 
     if cfg is None:
-        rich.print(f"[red]Failed to get {cfg_type} configuration from device at {port}[/red]")
-        raise typer.Exit(code=1)
+        rprint(f"[red]Failed to get {cfg_type.value} configuration from device at {port}[/red]")
+        raise SystemExit(1)
 
     if save:
-        with open(save, "w") as f:
-            f.write(MessageToJson(cfg))
-            rich.print(f"Configuration saved to {save}")
+        if save_format == "json":
+            from google.protobuf.json_format import MessageToDict
+            d = MessageToDict(cfg, preserving_proto_field_name=True,
+                              use_integers_for_enums=True)
+            try:
+                import orjson
+                data = orjson.dumps(d, option=orjson.OPT_INDENT_2)
+            except ImportError:
+                import json
+                data = json.dumps(d, indent=2).encode()
+            with open(save, "wb") as f:
+                f.write(data)
+        else:
+            with open(save, "wb") as f:
+                f.write(cfg.SerializeToString())
+        rprint(f"Configuration saved to {save}")
+
+    rprint(text_format.MessageToString(cfg, as_utf8=True))
+
 
-    cfg = MessageToDict(cfg)
-    rich.print(cfg)
+def _load_config(file: Path, cfg_type: ConfigType):
+    """Parse a SysConfig/StimConfig message from the JSON file FILE.
+
+    Parsed messages are cached per file and modification time, so applying
+    the same file to several devices parses it once. The returned message
+    must not be modified.
+    """
+    file = file.resolve()
+    return _parse_config_file(file, file.stat().st_mtime_ns, cfg_type)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(file: Path, mtime_ns: int, cfg_type: ConfigType):
+    from google.protobuf.json_format import Parse
+    from smartvns.config import CONFIG_CLASSES
+
+    value = CONFIG_CLASSES[cfg_type.value]()
+    Parse(file.read_text(), value)
+    return value
 
 
-@set_app.command("config")
 def set_config(cfg_type: ConfigType,
-              port: Annotated[str, typer.Argument()],
-              file: Annotated[Union[Path, None], typer.Option(help="If provided, save configuration to this file.")] = None):
+               port: str,
+               file: Optional[Path] = None):
 
     """Set configuration on device(s).
 
-    cfg_type must be 'sys' or 'stim'. VALUE is a string representation of the
-    configuration to set; this is a thin wrapper and currently calls a controller
-    stub which will apply the value to the device(s).
+    cfg_type must be 'sys' or 'stim'. FILE holds the configuration to set,
+    either as binary protobuf ('.pb'/'.bin') or as JSON ('.json'), like the
+    files written by ``get config --save``. Binary files are sent as they
+    are, without being parsed.
     """
+    cfg_type = ConfigType(cfg_type)
 
-    if file:
-        with open(file, "r") as f:
-            data = f.read()
-        if cfg_type == ConfigType.sys:
-            value = SysConfig()
-        else:
-            value = StimConfig()
-        value = Parse(data, value)
+    from rich import print as rprint
+    from . import routines
 
+    if file is None:
+        rprint("[red]No configuration file provided[/red]")
+        raise SystemExit(1)
 
-    asyncio.run(routines.set_config(port, cfg_type.value, value))
+    file = Path(file)
+    file_format = _config_format(file)
+    _release_ports([port])
+    if file_format == "binary":
+        _run(routines.set_config_raw(port, cfg_type.value, file.read_bytes()))
+        return
 
+    value = _load_config(file, cfg_type)
 
-@app.command()
-def reboot(ports: Annotated[List[str], typer.Argument()]):
+    _run(routines.set_config(port, cfg_type.value, value))
+
+
+def reboot(ports: List[str]):
     """Reset connected devices."""
-    asyncio.run(routines.reboot(ports))
+
+    _run_routine("reboot", ports)
 
 
-@app.command(name="factory-reset")
-def factory_reset(ports: Annotated[List[str], typer.Argument()]):
+def factory_reset(ports: List[str]):
     """Erase storage and reset devices (full factory reset)."""
-    asyncio.run(routines.factory_reset(ports))
 
+    _run_routine("factory_reset", ports)
 
-@app.command()
-def dfu(
-    path: Annotated[Path, typer.Argument(exists=True, dir_okay=False, readable=True)],
-    ports: Annotated[List[str], typer.Argument()],
-):
+
+def dfu(path: Path, ports: List[str]):
     """Reboot to bootloader on devices and upload image from PATH."""
-    image = open(path, "rb").read()
+    from rich import print as rprint
+    from . import routines
+
+    path = Path(path)
+    if path.stat().st_size == 0:
+        rprint(f"[red]Image {path} is empty[/red]")
+        raise SystemExit(1)
 
-    asyncio.run(routines.dfu(ports, image))
+    _release_ports(ports)
+    _run(routines.dfu(ports, path))
 
 
-@app.command()
-def pair(port1: str = typer.Argument(...), port2: str = typer.Argument(...)):
+def pair(port1: str, port2: str):
     """Exchange OOB keys to pair two connected devices."""
-    asyncio.run(routines.pair(port1, port2))
+    from . import routines
 
+    _release_ports([port1, port2])
+    _run(routines.pair(port1, port2))
 
-@app.command()
-def unpair(port1: str = typer.Argument(...), port2: str = typer.Argument(...)):
+
+def unpair(port1: str, port2: str):
     """Clear pairing information from two connected devices."""
-    asyncio.run(routines.unpair(port1, port2))
+    from . import routines
+
+    _release_ports([port1, port2])
+    _run(routines.unpair(port1, port2))
+
+
+def daemon_start():
+    """Run the background service that other commands forward to."""
+    from rich import print as rprint
+    from . import _daemon
+
+    if not _daemon.supported():
+        rprint("[red]The daemon requires Unix domain sockets, which are not available on this platform[/red]")
+        raise SystemExit(1)
+
+    try:
+        _run(_daemon.serve())
+    except RuntimeError as e:
+        rprint(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+
+def daemon_stop():
+    """Stop the background service."""
+    from rich import print as rprint
+    from . import _daemon
+
+    try:
+        _daemon.stop()
+    except _daemon.DaemonUnavailable:
+        rprint("[red]No daemon is running[/red]")
+        raise SystemExit(1)
+
+
+def _existing_file(value: str) -> Path:
+    path = Path(value)
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(f"'{value}' is not an existing file")
+    return path
+
+
+def _add_command(commands, name: str, func) -> argparse.ArgumentParser:
+    """Register FUNC as subcommand NAME, using its docstring as help."""
+    # docstrings are stripped under python -OO
+    summary = func.__doc__.strip().splitlines()[0] if func.__doc__ else None
+    parser = commands.add_parser(name, help=summary, description=summary)
+    parser.set_defaults(func=func)
+    return parser
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="smartvns-cli")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    # subcommand groups for get and set to organize device queries/commands
+    get_cmds = commands.add_parser("get", help="Query devices.") \
+        .add_subparsers(dest="subcommand", metavar="COMMAND", required=True)
+    set_cmds = commands.add_parser("set", help="Configure devices.") \
+        .add_subparsers(dest="subcommand", metavar="COMMAND", required=True)
+
+    daemon_cmds = commands.add_parser("daemon", help="Manage the background service.") \
+        .add_subparsers(dest="subcommand", metavar="COMMAND", required=True)
+
+    _add_command(commands, "list", list_ports)
+
+    p = _add_command(set_cmds, "time", set_datetime)
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    p = _add_command(get_cmds, "battery", get_battery)
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    p = _add_command(get_cmds, "version", get_fw_version)
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    cfg_choices = [t.value for t in ConfigType]
+
+    p = _add_command(get_cmds, "config", get_config)
+    p.add_argument("cfg_type", choices=cfg_choices)
+    p.add_argument("port", metavar="PORT")
+    p.add_argument("--save", type=Path, help="If provided, save configuration to this file "
+                        "(JSON for '.json' files, binary protobuf for '.pb'/'.bin').")
+
+    p = _add_command(set_cmds, "config", set_config)
+    p.add_argument("cfg_type", choices=cfg_choices)
+    p.add_argument("port", metavar="PORT")
+    p.add_argument("--file", type=_existing_file, required=True,
+                   help="Configuration file to apply (binary protobuf for '.pb'/'.bin' files, JSON for '.json').")
+
+    p = _add_command(commands, "reboot", reboot)
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    p = _add_command(commands, "factory-reset", factory_reset)
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    p = _add_command(commands, "dfu", dfu)
+    p.add_argument("path", type=_existing_file, metavar="PATH")
+    p.add_argument("ports", nargs="+", metavar="PORTS")
+
+    for name, func in (("pair", pair), ("unpair", unpair)):
+        p = _add_command(commands, name, func)
+        p.add_argument("port1", metavar="PORT1")
+        p.add_argument("port2", metavar="PORT2")
+
+    _add_command(daemon_cmds, "start", daemon_start)
+    _add_command(daemon_cmds, "stop", daemon_stop)
+
+    return parser
+
+
+def app(argv: Optional[Sequence[str]] = None):
+    """Parse ARGV (defaults to ``sys.argv[1:]``) and run the selected command."""
+    args = vars(_build_parser().parse_args(argv))
+    func = args.pop("func")
+    args.pop("command")
+    args.pop("subcommand", None)
+    func(**args)
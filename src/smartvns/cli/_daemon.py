@@ -0,0 +1,179 @@
+"""Background service running CLI routines on one long-lived event loop.
+
+``smartvns-cli daemon start`` serves requests on a Unix domain socket; the
+other CLI commands forward to it when it is running, which avoids paying the
+interpreter, smpclient and protobuf start-up cost on every invocation. If no
+daemon is listening the commands run their routines in-process as before.
+
+The protocol is one JSON object per line in each direction::
+
+    -> {"cmd": "get_battery", "args": [["/dev/ttyACM0"]]}
+    <- {"ok": true, "result": [87]}
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, List
+
+# routines which may be forwarded to the daemon; their arguments and results
+# must be JSON serializable
+COMMANDS = ("set_time", "get_battery", "get_version", "reboot", "factory_reset")
+
+_STOP = "stop"
+_RELEASE = "release"
+
+
+class DaemonUnavailable(Exception):
+    """Raised when no daemon is listening on the socket."""
+
+
+def supported() -> bool:
+    """Whether Unix domain sockets can be used on this platform."""
+    return sys.platform != "win32" and hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> Path:
+    """Return the socket path, ``$XDG_RUNTIME_DIR/smartvns.sock`` if available.
+
+    Otherwise the socket is placed in a per-user directory in the temporary
+    directory, created by :func:`serve` with mode 0700. Only call this if
+    :func:`supported`.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "smartvns.sock"
+    return Path(tempfile.gettempdir()) / f"smartvns-{os.getuid()}" / "smartvns.sock"
+
+
+def _private(path: Path, mask: int) -> bool:
+    """Whether PATH is owned by the current user and has none of the MASK
+    permission bits set."""
+    st = path.lstat()
+    return st.st_uid == os.getuid() and not st.st_mode & mask
+
+
+def _listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def call(cmd: str, *args: Any, timeout: float = 120.0) -> Any:
+    """Run routine CMD with ARGS in the daemon and return its result.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening.
+        RuntimeError: If the routine failed in the daemon.
+    """
+    if not supported():
+        raise DaemonUnavailable()
+    path = socket_path()
+    if not path.exists():
+        raise DaemonUnavailable()
+    # never send requests to a socket someone else could have placed there
+    if not (_private(path.parent, 0o077) and _private(path, 0o077)):
+        raise DaemonUnavailable(f"{path} is not private to the current user")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            raise DaemonUnavailable()
+        sock.sendall(json.dumps({"cmd": cmd, "args": args}).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise RuntimeError(f"Daemon closed the connection while running {cmd}")
+    reply = json.loads(line)
+    if not reply["ok"]:
+        raise RuntimeError(reply["error"])
+    return reply.get("result")
+
+
+def stop() -> None:
+    """Ask a running daemon to shut down.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening.
+    """
+    call(_STOP)
+
+
+def release(ports: List[str]) -> None:
+    """Ask a running daemon to close its connections to PORTS, so that this
+    process can open them.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening.
+    """
+    call(_RELEASE, ports)
+
+
+async def serve() -> None:
+    """Serve routine requests on :func:`socket_path` until asked to stop."""
+    import asyncio
+    import logging
+    from . import routines
+
+    log = logging.getLogger("smartvns_daemon")
+    path = socket_path()
+    # requests are serialized so two clients never drive a port concurrently
+    lock = asyncio.Lock()
+    done = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.readline())
+            cmd = request["cmd"]
+            if cmd == _STOP:
+                reply = {"ok": True}
+                done.set()
+            elif cmd == _RELEASE:
+                async with lock:
+                    await routines.close_clients(*request["args"])
+                reply = {"ok": True}
+            elif cmd in COMMANDS:
+                async with lock:
+                    result = await getattr(routines, cmd)(*request["args"])
+                reply = {"ok": True, "result": result}
+            else:
+                reply = {"ok": False, "error": f"Unknown command: {cmd}"}
+        except Exception as e:
+            log.exception("Request failed")
+            reply = {"ok": False, "error": str(e)}
+
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    path.parent.mkdir(mode=0o700, exist_ok=True)
+    if not _private(path.parent, 0o077):
+        raise RuntimeError(f"{path.parent} must be owned by the current user "
+                           f"and not accessible by others")
+
+    if path.exists():
+        if _listening(path):
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        # left over from a daemon that did not shut down cleanly
+        path.unlink()
+
+    # the daemon owns the ports while running: keep them open between requests
+    routines.enable_client_pool()
+    server = await asyncio.start_unix_server(handle, path=str(path))
+    os.chmod(path, 0o600)
+    log.info(f"Listening on {path}")
+    try:
+        async with server:
+            await done.wait()
+    finally:
+        if path.exists():
+            path.unlink()
+        await routines.close_clients()
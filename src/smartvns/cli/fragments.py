@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import logging
+import mmap
 from datetime import datetime
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 import base64
 
 from smpclient import SMPClient
@@ -9,45 +12,64 @@ from smpclient.requests.shell_management import Execute
 from smpclient.requests.zephyr_management import EraseStorage
 from smpclient.requests.os_management import DateTimeRead, DateTimeWrite, ResetWrite
 
-from smartvns.config import SysConfig, StimConfig
+from smartvns import config
+
+if TYPE_CHECKING:
+    # only needed for annotations; importing them loads protobuf
+    from smartvns.config import SysConfig, StimConfig
+
+try:
+    import tqdm
+except ImportError:
+    tqdm = None
+
 log = logging.getLogger("smp_routines")
 
+# fixed shell commands. The Execute requests themselves are built per call:
+# every request carries its own header sequence number.
+_BOND_GET_ARGV = ("bond", "get")
+_BOND_DEL_ARGV = ("bond", "del", "vns")
+_DFU_ARGV = ("dfu",)
+_BATT_ARGV = ("batt",)
+_VERSION_ARGV = ("version",)
+
 
 def shell_ok(response: str) -> bool:
     return response.startswith("OK:")
 
 
-async def fragment_set_time(dev: SMPClient) -> bool:
-    response = await dev.request(DateTimeRead())
-    if success(response):
-        log.debug(f"Current datetime on device: {response.datetime}")
-    else:
-        log.debug(f"Device has no datetime set")
+def _ok_payload(output: str) -> Optional[str]:
+    """Return the payload of an 'OK: <payload>' shell OUTPUT, None otherwise."""
+    output = output.strip()
+    return output[4:] if shell_ok(output) else None
 
+
+async def fragment_set_time(dev: SMPClient) -> bool:
     response = await dev.request(
         DateTimeWrite(datetime=datetime.now().isoformat(timespec='milliseconds')))
     if error(response):
         log.error(f"Failed to set datetime: {response}")
+        return False
 
-    response = await dev.request(DateTimeRead())
-    if success(response):
-        log.info(f"New datetime on device: {response.datetime}")
+    # reading the time back costs a round-trip, only do it for the debug log
+    if log.isEnabledFor(logging.DEBUG):
+        response = await dev.request(DateTimeRead())
+        if success(response):
+            log.debug(f"New datetime on device: {response.datetime}")
 
-    return success(response)
+    return True
 
 
 async def fragment_get_oob_key(dev: SMPClient) -> Optional[str]:
-    response = await dev.request(Execute(
-        argv=["bond", "get"]
-    ))
+    response = await dev.request(Execute(argv=_BOND_GET_ARGV))
 
     if success(response):
-        output = response.o.strip()
-        if shell_ok(output):
+        key = _ok_payload(response.o)
+        if key is not None:
             log.info("Key received")
-            return str.strip(output[4:])
+            return key.strip()
         else:
-            log.error(f"Failed to get key: {output}")
+            log.error(f"Failed to get key: {response.o.strip()}")
             return None
 
 
@@ -69,9 +91,7 @@ async def fragment_set_oob_key(dev: SMPClient, key: str) -> bool:
 
 
 async def fragment_del_oob_key(dev: SMPClient) -> bool:
-    response = await dev.request(Execute(
-        argv=["bond", "del", "vns"]
-    ))
+    response = await dev.request(Execute(argv=_BOND_DEL_ARGV))
 
     if error(response):
         log.error(f"Failed to delete key: {response}")
@@ -107,9 +127,7 @@ async def fragment_factory_reset(dev: SMPClient) -> bool:
 
 
 async def fragment_set_bootmode(dev: SMPClient) -> bool:
-    response = await dev.request(Execute(
-        argv=["dfu"]
-    ))
+    response = await dev.request(Execute(argv=_DFU_ARGV))
 
     if error(response):
         log.error(f"Failed to send DFU command: {response}")
@@ -120,21 +138,22 @@ async def fragment_set_bootmode(dev: SMPClient) -> bool:
     return True
 
 
-async def fragment_upload_image(dev: SMPClient, image: bytes):
+async def fragment_upload_image(dev: SMPClient, image: Union[bytes, mmap.mmap]):
     it = dev.upload(
         image=image,
         slot=0,
     )
 
-    try:
-        import tqdm
-        pbar = tqdm.tqdm(total=len(image), unit='B', unit_scale=True, desc="Uploading")
-        async for offset in it:
-            pbar.update(offset - pbar.n)
-        pbar.close()
-    except Exception:
+    if tqdm is None:
         async for _ in it:
             pass
+        return
+
+    # redraw at most 4 times a second and every 0.5% of the image
+    with tqdm.tqdm(total=len(image), unit='B', unit_scale=True, desc="Uploading",
+                   mininterval=0.25, miniters=max(1, len(image) // 200)) as pbar:
+        async for offset in it:
+            pbar.update(offset - pbar.n)
 
 
 async def fragment_get_config(dev: SMPClient, cfg_type: str = "sys") -> Optional[Union[SysConfig, StimConfig]]:
@@ -147,17 +166,13 @@ async def fragment_get_config(dev: SMPClient, cfg_type: str = "sys") -> Optional
         log.error(f"Failed to get config: {response}")
         return None
 
-    output = response.o.strip()
-    if not shell_ok(output):
-        log.error(f"Failed to get config: {output}")
+    payload = _ok_payload(response.o)
+    if payload is None:
+        log.error(f"Failed to get config: {response.o.strip()}")
         return None
 
-    data = base64.b64decode(response.o.strip()[4:])
-    if cfg_type == "sys":
-        cfg = SysConfig()
-    else:
-        cfg = StimConfig()
-
+    data = base64.b64decode(payload)
+    cfg = config.CONFIG_CLASSES[cfg_type]()
     cfg.ParseFromString(data)
     return cfg
 
@@ -169,9 +184,17 @@ async def fragment_set_config(dev: SMPClient, cfg_type: str, value: Union[SysCon
     given cfg_type. This is a thin wrapper around the shell 'cfg set' command.
     """
 
+    return await fragment_set_config_raw(dev, cfg_type, value.SerializeToString())
+
+
+async def fragment_set_config_raw(dev: SMPClient, cfg_type: str, data: bytes) -> bool:
+    """Send an already serialized configuration message to device.
+
+    DATA is sent as is, without being parsed or validated.
+    """
+
     # Ensure we send a base64-encoded string payload to the device shell.
-    serialized = value.SerializeToString()
-    b64 = base64.b64encode(serialized).decode('ascii')
+    b64 = base64.b64encode(data).decode('ascii')
     response = await dev.request(Execute(
         argv=["cfg", "set", cfg_type, b64]
     ))
@@ -190,28 +213,22 @@ async def fragment_set_config(dev: SMPClient, cfg_type: str, value: Union[SysCon
 
 
 async def fragment_get_battery(dev: SMPClient) -> Optional[int]:
-    response = await dev.request(Execute(
-        argv=["batt"]
-    ))
+    response = await dev.request(Execute(argv=_BATT_ARGV))
 
     if error(response):
         log.error(f"Failed to get battery: {response}")
         return None
 
-    output = getattr(response, "o", "").strip()
-    if shell_ok(output):
-        return int(output[4:])
+    payload = _ok_payload(getattr(response, "o", ""))
+    if payload is not None:
+        return int(payload)
 
 
 async def fragment_get_version(dev: SMPClient) -> Optional[str]:
-    response = await dev.request(Execute(
-        argv=["version"]
-    ))
+    response = await dev.request(Execute(argv=_VERSION_ARGV))
 
     if error(response):
         log.error(f"Failed to get version: {response}")
         return None
 
-    output = getattr(response, "o", "").strip()
-    if shell_ok(output):
-        return output[4:]
+    return _ok_payload(getattr(response, "o", ""))
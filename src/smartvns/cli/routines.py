@@ -1,23 +1,191 @@
+from __future__ import annotations
+
 import asyncio
+import contextlib
 import logging
-import time
-from typing import List, Optional, Union
+import mmap
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar, Union
 
 from smpclient import SMPClient
 from smpclient.transport.serial import SMPSerialTransport
-from serial.tools import list_ports
 
-from smartvns.config import SysConfig, StimConfig
 from . import fragments
 
+if TYPE_CHECKING:
+    # only needed for annotations; importing them loads protobuf
+    from smartvns.config import SysConfig, StimConfig
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 log = logging.getLogger("smp_usb_controller")
 
+_T = TypeVar("_T")
+
+# how long devices may take to re-enumerate after a reboot, and how often
+# the serial ports are listed meanwhile
+_REENUMERATE_TIMEOUT = 5.0
+_POLL_INTERVAL = 0.25
+
+
+# Connected clients by port, kept between routines once enabled with
+# enable_client_pool(). Only the daemon does so: it runs every routine on one
+# loop and is the only process using the ports while it is running. None
+# while disabled, then each routine opens and closes its own clients.
+_CLIENTS: Optional[dict[str, SMPClient]] = None
+
+
+def enable_client_pool() -> None:
+    """Keep clients connected between routines instead of closing them.
+
+    Call :func:`close_clients` before the event loop running the routines is
+    closed.
+    """
+    global _CLIENTS
+    if _CLIENTS is None:
+        _CLIENTS = {}
+
+
+async def _open_client(port: str) -> SMPClient:
+    dev = SMPClient(transport=SMPSerialTransport(), address=port)
+    try:
+        await dev.connect()
+    except BaseException:
+        await dev.disconnect()
+        raise
+    return dev
+
+
+async def _acquire(port: str) -> tuple[SMPClient, bool]:
+    """Return a connected client of PORT and whether it was taken from the pool."""
+    if _CLIENTS is not None and port in _CLIENTS:
+        return _CLIENTS[port], True
+    dev = await _open_client(port)
+    if _CLIENTS is not None:
+        pooled = _CLIENTS.get(port)
+        if pooled is not None:
+            # another routine connected the port meanwhile: keep its client
+            await _release(port, dev, close=True)
+            return pooled, True
+        _CLIENTS[port] = dev
+    return dev, False
+
+
+async def _release(port: str, dev: SMPClient, close: bool = False) -> None:
+    """Done with DEV: disconnect it unless it is pooled and CLOSE is unset."""
+    if _CLIENTS is not None:
+        if not close:
+            return
+        if _CLIENTS.get(port) is dev:
+            del _CLIENTS[port]
+    # the port may already be gone, e.g. after a reset
+    with contextlib.suppress(OSError):
+        await dev.disconnect()
+
+
+async def close_clients(ports: Optional[List[str]] = None) -> None:
+    """Disconnect the pooled clients of PORTS, or all of them."""
+    if _CLIENTS is None:
+        return
+    ports = list(_CLIENTS) if ports is None else [p for p in ports if p in _CLIENTS]
+    await asyncio.gather(*(_release(port, _CLIENTS[port], close=True) for port in ports))
+
+
+async def _on_port(port: str, op: Callable[[SMPClient], Awaitable[_T]], reset: bool = False) -> _T:
+    """Run OP with a connected client of PORT.
+
+    A pooled client is retried once with a new connection if OP fails with a
+    transport error: it may have gone stale since its last use, e.g. because
+    the device was reset or replugged meanwhile. RESET closes the client
+    afterwards, for operations resetting the device.
+    """
+    while True:
+        dev, pooled = await _acquire(port)
+        try:
+            result = await op(dev)
+        except OSError:
+            await _release(port, dev, close=True)
+            if pooled:
+                log.info(f"Reconnecting to {port}")
+                continue
+            raise
+        except BaseException:
+            await _release(port, dev, close=True)
+            raise
+        await _release(port, dev, close=reset)
+        return result
+
+
+async def _on_ports(ports: List[str], op: Callable[[SMPClient], Awaitable[_T]],
+                    reset: bool = False) -> List[_T]:
+    """Run OP on all PORTS concurrently, see :func:`_on_port`.
+
+    OP runs once per distinct port; its result is repeated for duplicates.
+    """
+    unique = list(dict.fromkeys(ports))
+    results = await asyncio.gather(*(_on_port(port, op, reset) for port in unique))
+    by_port = dict(zip(unique, results))
+    return [by_port[port] for port in ports]
+
+
+@contextlib.asynccontextmanager
+async def _connected(ports: List[str], reset: bool = False) -> AsyncIterator[List[SMPClient]]:
+    """Connect to all PORTS concurrently for a multi-step routine.
+
+    The clients are closed on exit if the body raised or RESET is set (the
+    devices are reset and their ports go away), or if pooling is disabled.
+    Each distinct port is connected once; duplicates share its client.
+    """
+    unique = list(dict.fromkeys(ports))
+    acquired = await asyncio.gather(*(_acquire(port) for port in unique),
+                                    return_exceptions=True)
+    opened = [(port, entry[0]) for port, entry in zip(unique, acquired)
+              if not isinstance(entry, BaseException)]
+    close = reset
+    try:
+        for entry in acquired:
+            if isinstance(entry, BaseException):
+                raise entry
+        by_port = dict(opened)
+        yield [by_port[port] for port in ports]
+    except BaseException:
+        close = True
+        raise
+    finally:
+        await asyncio.gather(*(_release(port, dev, close) for port, dev in opened))
+
+
+async def _wait_for_reenumeration(before: dict[str, str],
+                                  timeout: float = _REENUMERATE_TIMEOUT) -> set:
+    """Wait for rebooting devices to drop off and come back as serial ports.
+
+    BEFORE maps the ports of the devices before the reboot to their hardware
+    ids. A port counts as reset once it is missing from a listing or listed
+    with another hardware id, e.g. a bootloader with its own USB ids that
+    came up between two listings. Returns the ports detected once all ports
+    were reset and as many are present again, or when TIMEOUT expires.
+    """
+    from serial.tools import list_ports
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    # the old ports are still listed until the devices actually reset
+    pending = set(before)
+
+    while True:
+        await asyncio.sleep(_POLL_INTERVAL)
+        comports = await asyncio.to_thread(list_ports.comports)
+        detected = {port.device: port.hwid for port in comports}
+        pending = {p for p in pending if detected.get(p) == before[p]}
+        if (not pending and len(detected) >= len(before)) or loop.time() >= deadline:
+            if pending:
+                log.warning(f"Ports not seen resetting: {sorted(pending)}")
+            return set(detected)
+
 
 async def pair(p1: str, p2: str):
 
-    async with SMPClient(transport=SMPSerialTransport(), address=p1) as dev1, \
-        SMPClient(transport=SMPSerialTransport(), address=p2) as dev2:
+    async with _connected([p1, p2]) as (dev1, dev2):
 
         keys = await asyncio.gather(
             fragments.fragment_get_oob_key(dev1),
@@ -36,8 +204,7 @@ async def pair(p1: str, p2: str):
 
 async def unpair(p1: str, p2: str):
 
-    async with SMPClient(transport=SMPSerialTransport(), address=p1) as dev1, \
-        SMPClient(transport=SMPSerialTransport(), address=p2) as dev2:
+    async with _connected([p1, p2]) as (dev1, dev2):
 
         await asyncio.gather(
             fragments.fragment_del_oob_key(dev1),
@@ -47,38 +214,41 @@ async def unpair(p1: str, p2: str):
 
 async def set_time(ports: List[str]):
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-    for dev in devs:
-        await dev.connect()
-
-    await asyncio.gather(*(fragments.fragment_set_time(dev) for dev in devs))
+    await _on_ports(ports, fragments.fragment_set_time)
 
 
 async def reboot(ports: List[str]):
 
     log.info(f"Operating on {len(ports)} devices: {ports}")
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-    for dev in devs:
-        await dev.connect()
-
-    await asyncio.gather(*(fragments.fragment_reboot(dev) for dev in devs))
+    await _on_ports(ports, fragments.fragment_reboot, reset=True)
 
 
 async def factory_reset(ports: List[str]):
     log.info(f"Operating on {len(ports)} devices: {ports}")
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-    for dev in devs:
-        await dev.connect()
+    await _on_ports(ports, fragments.fragment_factory_reset, reset=True)
+
 
-    await asyncio.gather(*(fragments.fragment_factory_reset(dev) for dev in devs))
+async def dfu(ports: List[str], path: Union[str, Path]):
+    """Reboot PORTS to the bootloader and upload the image file at PATH.
 
+    The file is memory-mapped rather than read: the upload slices it chunk by
+    chunk, so pages are read from disk (with the OS' read-ahead) as they are
+    sent instead of loading the whole image before the first write. All
+    devices share the mapping; only the chunk being sent is copied. It is
+    mapped before the devices are switched to the bootloader.
+
+    Raises:
+        OSError: If the image cannot be opened or mapped.
+        ValueError: If the image is empty.
+    """
+    from serial.tools import list_ports
 
-async def dfu(ports: List[str], image: bytes):
     log.info(f"Operating on {len(ports)} devices (boot->dfu): {ports}")
 
-    detected_ports = {port.device for port in list_ports.comports()}
+    comports = list_ports.comports()
+    detected_ports = {port.device for port in comports}
 
     # check that they correspond to selected devices
     ok = set([p.upper() for p in ports]) == set([p.upper() for p in detected_ports])
@@ -86,49 +256,48 @@ async def dfu(ports: List[str], image: bytes):
         log.error("Mismatch between selected ports and detected ports, aborting DFU")
         return
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-
-    await asyncio.gather(*[dev.connect() for dev in devs])
-    await asyncio.gather(*(fragments.fragment_set_bootmode(dev) for dev in devs))
-    await asyncio.gather(*(fragments.fragment_reboot(dev) for dev in devs))
+    # open the image before touching the devices: a bad path must not leave
+    # them stuck in the bootloader
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Image {path} is empty")
+        image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            # the image is read front to back: read ahead aggressively
+            image.madvise(mmap.MADV_SEQUENTIAL)
 
-    time.sleep(5)
+        async with _connected(ports, reset=True) as devs:
+            await asyncio.gather(*(fragments.fragment_set_bootmode(dev) for dev in devs))
+            await asyncio.gather(*(fragments.fragment_reboot(dev) for dev in devs))
 
-    detected_ports = {port.device for port in list_ports.comports()}
+        detected_ports = await _wait_for_reenumeration(
+            {port.device: port.hwid for port in comports})
 
-    # Reconnect to bootloader and upload
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in detected_ports]
-
-    await asyncio.gather(*[dev.connect() for dev in devs])
-    await asyncio.gather(*(fragments.fragment_upload_image(dev, image) for dev in devs))
-    await asyncio.gather(*(fragments.fragment_reboot(dev) for dev in devs))
+        # Reconnect to bootloader and upload
+        async with _connected(list(detected_ports), reset=True) as devs:
+            await asyncio.gather(*(fragments.fragment_upload_image(dev, image) for dev in devs))
+            await asyncio.gather(*(fragments.fragment_reboot(dev) for dev in devs))
+    finally:
+        image.close()
 
 
 async def get_battery(ports: List[str]) -> List[Optional[int]]:
     log.info(f"Operating on {len(ports)} devices: {ports}")
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-
-    await asyncio.gather(*[dev.connect() for dev in devs])
-
-    return await asyncio.gather(*(fragments.fragment_get_battery(dev) for dev in devs))
+    return await _on_ports(ports, fragments.fragment_get_battery)
 
 
 async def get_version(ports: List[str]) -> List[Optional[str]]:
     log.info(f"Operating on {len(ports)} devices: {ports}")
 
-    devs = [SMPClient(transport=SMPSerialTransport(), address=port) for port in ports]
-
-    await asyncio.gather(*[dev.connect() for dev in devs])
-
-    return await asyncio.gather(*(fragments.fragment_get_version(dev) for dev in devs))
+    return await _on_ports(ports, fragments.fragment_get_version)
 
 
 async def get_config(port: str, cfg_type: str = "sys") -> Optional[Union[SysConfig, StimConfig]]:
     log.info(f"Operating on {port} (cfg_type={cfg_type})")
 
-    async with SMPClient(transport=SMPSerialTransport(), address=port) as dev:
-        return await fragments.fragment_get_config(dev, cfg_type)
+    return await _on_port(port, lambda dev: fragments.fragment_get_config(dev, cfg_type))
 
 
 async def set_config(port: str, cfg_type: str, cfg: Union[SysConfig, StimConfig]):
@@ -139,5 +308,15 @@ async def set_config(port: str, cfg_type: str, cfg: Union[SysConfig, StimConfig]
     """
     log.info(f"Setting config {cfg_type} on {port}")
 
-    async with SMPClient(transport=SMPSerialTransport(), address=port) as dev:
-        await fragments.fragment_set_config(dev, cfg_type, cfg)
+    await _on_port(port, lambda dev: fragments.fragment_set_config(dev, cfg_type, cfg))
+
+
+async def set_config_raw(port: str, cfg_type: str, data: bytes):
+    """Set a serialized configuration message on given port.
+
+    cfg_type: 'sys' or 'stim'
+    data: binary protobuf message, sent without being parsed
+    """
+    log.info(f"Setting config {cfg_type} on {port}")
+
+    await _on_port(port, lambda dev: fragments.fragment_set_config_raw(dev, cfg_type, data))
@@ -1,24 +1,13 @@
 """
 Utilities for encoding/decoding Sys and Stim configurations (protobuf).
 
+The generated protobuf module is imported on first access of one of the
+exported names, so importing this package alone is cheap.
 """
-try:
-    # Prefer the in-repo generated package path
-    from .proto.generated.python.smartvns_pb2 import  (
-        SysConfig,
-        StimConfig,
-        IMUConf,
-        MAGConf,
-        AccFS,
-        GyroFS,
-        Dispatcher,
-    )
-except Exception:
-    raise ImportError(
-        "Could not import generated protobuf symbols for smartvns.\n"
-        "Ensure the generated Python sources from protobuf/generated/python are on PYTHONPATH,\n"
-        "or install the generated module so it is importable as `smartvns_pb2`."
-    )
+import importlib
+import os
+import sys
+import warnings
 
 __all__ = [
     "SysConfig",
@@ -28,130 +17,47 @@ __all__ = [
     "AccFS",
     "GyroFS",
     "Dispatcher",
+    "CONFIG_CLASSES",
 ]
 
 
-# Attach Google-style docstrings to the imported protobuf message classes so
-# Sphinx/autodoc and IDEs show helpful documentation. These do not change
-# runtime behavior of the generated classes; they only provide human-readable
-# docs at runtime.
-SysConfig.__doc__ = """System configuration for SmartVNS devices.
-
-The message contains settings for the IMU, magnetometer
-and dispatcher streams.
-
-Args:
-    retain_cfg (bool): Persist configuration on device when written.
-    imu (IMUConf): IMU configuration (gyro and accelerometer full-scale and ODR).
-    mag (MAGConf): Magnetometer configuration (ODR).
-    dispatch (Dispatcher): Define which data to stream to BLE and/or memory.
-
-
-Initialization examples (set all fields):
-
-1) Construct and set fields manually::
-
-    cfg = SysConfig()
-    cfg.retain_cfg = False
-    cfg.imu.gyro_fs = GyroFS.FS_500DPS
-    cfg.imu.acc_fs = AccFS.FS_4G
-    cfg.imu.odr = 60    # in Hz
-    cfg.mag.odr = 10    # in Hz
-
-    # Explicitly set all dispatcher stream flags for both destinations
-    cfg.dispatch.to_ble.imu = True
-    cfg.dispatch.to_ble.mag = True
-    cfg.dispatch.to_ble.quat = False
-    cfg.dispatch.to_ble.log = False
-    cfg.dispatch.to_ble.vnsdata = False
-
-    cfg.dispatch.to_mem.imu = True
-    cfg.dispatch.to_mem.mag = True
-    cfg.dispatch.to_mem.quat = False
-    cfg.dispatch.to_mem.log = False
-    cfg.dispatch.to_mem.vnsdata = False
-
-2) Build from a Python dict using ``google.protobuf.json_format.ParseDict``::
-
-    from google.protobuf.json_format import ParseDict
-
-    d = {
-        "retain_cfg": True,
-        "imu": {"gyro_fs": "FS_500DPS", "acc_fs": "FS_4G", "odr": 60},
-        "mag": {"odr": 10},
-        "dispatch": {
-            "to_ble": {"imu": True, "mag": True, "quat": False, "log": False, "vnsdata": False},
-            "to_mem": {"imu": True, "mag": True, "quat": False, "log": False, "vnsdata": False}
-        }
-    }
-
-    cfg = SysConfig(**d)
-
-Notes:
-    - When using ``ParseDict`` enum fields may be provided as their symbolic
-      names (e.g. ``"FS_500DPS"``) or numeric values.
-"""
-
-
-StimConfig.__doc__ = """Stimulation configuration for SmartVNS Stimulator devices.
-
-Fields:
-    retain_cfg (bool): Persist configuration on device when written.
-    trigger_ms (int): Stimulation pulse duration in milliseconds.
-    forward_us (int): Forward delay in microseconds.
-    deadband_us (int): Deadband duration in microseconds.
-    period_us (int): Overall stimulation period in microseconds.
-    intensity_uA (int): Stimulation intensity in microamperes.
-
-Note: All fields are required by the proto schema; explicitly initialize all
-fields before use.
-
-Initialization examples (set all fields):
-
-    # Manual construction - set each required field
-    s = StimConfig()
-    s.retain_cfg = False
-    s.trigger_ms = 1000
-    s.forward_us = 250
-    s.deadband_us = 100
-    s.period_us = 40000
-    s.intensity_uA = 150
-
-    # From a dict using json_format.ParseDict - include all fields
-    from google.protobuf.json_format import ParseDict
-    d = {
-        "retain_cfg": False,
-        "trigger_ms": 1000,
-        "forward_us": 250,
-        "deadband_us": 100,
-        "period_us": 40000,
-        "intensity_uA": 100,
-    }
-    stim_cfg = StimConfig(**d)
-"""
-
-
-Dispatcher.__doc__ = """Dispatcher configuration controlling streamed outputs.
-
-The ``Dispatcher`` message contains an embedded ``Stream`` message with
-boolean flags indicating which data streams are routed to the BLE interface
-(``to_ble``) and which are stored to memory (``to_mem``).
-
-Stream fields (inside ``Dispatcher.Stream``):
-    imu (bool): Include IMU data stream.
-    mag (bool): Include magnetometer stream.
-    quat (bool): Include quaternion stream.
-    log (bool): Include device logs.
-    vnsdata (bool): Include SmartVNS-specific data.
-
-Example (dict-style construction using ``ParseDict``)::
-
-    # Provide all stream flags for both destinations
-    "d": {
-        "to_ble": {"imu": True, "mag": True, "quat": False, "log": False, "vnsdata": False},
-        "to_mem": {"imu": True, "mag": True, "quat": False, "log": False, "vnsdata": False}
-    }
-    from google.protobuf.json_format import ParseDict
-    disp = Dispatcher()
-    ParseDict(d, disp)
-"""
+def _load() -> None:
+    """Import the generated protobuf module and bind the exported names."""
+    try:
+        # Prefer the in-repo generated package path
+        pb = importlib.import_module(".proto.generated.python.smartvns_pb2", __name__)
+    except ImportError as e:
+        raise ImportError(
+            "Could not import generated protobuf symbols for smartvns.\n"
+            "Ensure the generated Python sources from protobuf/generated/python are on PYTHONPATH,\n"
+            "or install the generated module so it is importable as `smartvns_pb2`."
+        ) from e
+
+    from google.protobuf.internal import api_implementation
+    if api_implementation.Type() == "python":
+        # protobuf>=4.21 ships the upb backend for all supported platforms, so
+        # this is usually due to PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python
+        warnings.warn(
+            "The pure-Python protobuf implementation is in use; parsing and "
+            "serializing configurations is considerably slower. Unset "
+            "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION to use the upb backend.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+    globals().update({name: getattr(pb, name) for name in __all__ if name != "CONFIG_CLASSES"})
+    # configuration message class by the type name used by the device shell
+    globals()["CONFIG_CLASSES"] = {"sys": pb.SysConfig, "stim": pb.StimConfig}
+
+    # The docstrings only matter for documentation builds and help(), so
+    # skip attaching them otherwise.
+    if os.environ.get("SMARTVNS_DOCS") or "sphinx" in sys.modules or hasattr(sys, "ps1"):
+        from . import _docs
+        _docs.install(pb)
+
+
+def __getattr__(name):
+    if name in __all__:
+        _load()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
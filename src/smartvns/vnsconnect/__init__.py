@@ -1,3 +1,5 @@
-from ._vnsconnect import Scanner, Stimulator, Tracker
+from ._vnsconnect import (BaseLoopRunner, LoopRunner, SyncLoopRunner, Scanner, ScanEntry,
+                          Stimulator, Tracker, connect_many, read_sys_config_many)
 
-__all__ = ["Scanner", "Stimulator", "Tracker"]
+__all__ = ["BaseLoopRunner", "LoopRunner", "SyncLoopRunner", "Scanner", "ScanEntry", "Stimulator",
+           "Tracker", "connect_many", "read_sys_config_many"]
@@ -1,7 +1,12 @@
+import abc
 import asyncio
+import atexit
+import functools
+import logging
 import threading
 import concurrent.futures
-from typing import Union, Coroutine, Callable
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Union, Coroutine, Callable
 
 from bleak.backends.device import BLEDevice
 from bleak import BleakClient, BleakScanner
@@ -10,8 +15,91 @@ from bleak.backends.scanner import AdvertisementData
 from smartvns.config import SysConfig, StimConfig
 from smartvns.vnsconnect.routines import *
 
+# advertised name prefix of SmartVNS devices
+_NAME_PREFIX = "SmartVNS"
 
-class LoopRunner():
+_log = logging.getLogger(__name__)
+
+
+def _connect_run_timeout(retries: int, timeout: float) -> float:
+    # all connection attempts and their backoff delays, plus one timeout for
+    # post-connect reads
+    return connect_with_retries_duration(retries, timeout) + timeout + 1
+
+
+def _forward(handler: Callable[[bytearray], None], _, data: bytearray) -> None:
+    # sender is known, no need to expose to user
+    handler(data)
+
+
+def _forward_view(handler: Callable[[memoryview], None], _, data: bytearray) -> None:
+    handler(memoryview(data))
+
+
+class BaseLoopRunner(abc.ABC):
+    """Interface of the runners executing the coroutines of SmartVNS objects.
+
+    Scanners and devices only use the methods below, so either runner can be
+    passed as their ``runner``: :class:`LoopRunner` runs the coroutines on a
+    background thread, :class:`SyncLoopRunner` on the calling thread. Custom
+    runners must implement all of them.
+
+    Attributes:
+        timeout (float): Default timeout used for startup and shutdown.
+    """
+
+    @abc.abstractmethod
+    def run(self, coro: Coroutine, timeout: float = 5):
+        """Run a coroutine and wait for its result.
+
+        Args:
+            coro: The coroutine object to execute on the runner's event loop.
+            timeout: Maximum seconds to wait for the coroutine to complete.
+
+        Returns:
+            The value returned by the coroutine.
+
+        Raises:
+            RuntimeError: If called from a coroutine running on the runner's
+                loop (use :meth:`run_async`), or if the loop is not usable.
+            TimeoutError: If the coroutine does not complete within ``timeout``.
+        """
+
+    @abc.abstractmethod
+    def run_async(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a coroutine from code already running on the event loop.
+
+        Args:
+            coro: The coroutine object to execute on the runner's event loop.
+
+        Returns:
+            asyncio.Task: Task wrapping the coroutine.
+
+        Raises:
+            RuntimeError: If not called from the runner's event loop.
+        """
+
+    @abc.abstractmethod
+    def gather(self, coros: Iterable[Coroutine], timeout: float = 5) -> list:
+        """Run several coroutines concurrently and wait for all of them.
+
+        Args:
+            coros: Coroutine objects to execute on the runner's event loop.
+            timeout: Maximum seconds to wait for all coroutines to complete.
+
+        Returns:
+            list: The coroutines' results, in submission order.
+
+        Raises:
+            TimeoutError: If not all coroutines complete within ``timeout``.
+        """
+
+    @abc.abstractmethod
+    def terminate(self):
+        """Stop the runner and close its event loop."""
+
+
+class LoopRunner(BaseLoopRunner):
     """Run asyncio coroutines in a dedicated background thread.
 
     LoopRunner creates a private :class:`asyncio` event loop running in a
@@ -24,9 +112,36 @@ class LoopRunner():
         _loop (asyncio.AbstractEventLoop): The event loop running in the
             background thread.
         _thread (threading.Thread): Daemon thread running ``_runner``.
-        _ready (threading.Event): Event set once the background loop is ready.
+        _ready (concurrent.futures.Future): Resolved once the background loop
+            is ready, or with the exception that prevented it from starting.
+        _loop_tid (int): Identifier of the thread running the loop.
     """
 
+    _instance: Optional["LoopRunner"] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "LoopRunner":
+        """Return the process-wide runner shared by all SmartVNS objects.
+
+        The runner is created on first use and stopped when the interpreter
+        exits. A new one is started if the shared runner was terminated.
+
+        Returns:
+            LoopRunner: The shared runner.
+        """
+        # lock-free fast path: every device and scanner calls this
+        runner = LoopRunner._instance
+        if runner is not None and runner._thread.is_alive():
+            return runner
+
+        with LoopRunner._instance_lock:
+            runner = LoopRunner._instance
+            if runner is None or not runner._thread.is_alive():
+                runner = LoopRunner._instance = LoopRunner()
+                atexit.register(runner.terminate)
+            return runner
+
     def __init__(self, timeout: float = 2.0):
         """Create and start the background asyncio loop thread.
 
@@ -41,24 +156,36 @@ class LoopRunner():
             target=self._runner,
             daemon=True
         )
-        self._ready = threading.Event()
+        self._ready = concurrent.futures.Future()
         self._thread.start()
 
-        # ready event used to sync startup
-        if not self._ready.wait(timeout=timeout):
+        # ready future used to sync startup
+        try:
+            self._ready.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
             raise RuntimeError("LoopRunner thread failed to start")
+        except Exception as e:
+            raise RuntimeError("LoopRunner thread failed to start") from e
 
     def _runner(self):
         """Internal thread target: set up and run the event loop.
 
         This method is executed in the background thread. It sets the loop
-        for the thread, signals readiness by setting ``_ready``, then runs the
-        loop until :meth:`terminate` requests a stop. After the loop stops
-        the loop object is closed.
+        for the thread, signals readiness by resolving ``_ready``, then runs
+        the loop until :meth:`terminate` requests a stop. After the loop
+        stops the loop object is closed.
         """
-        asyncio.set_event_loop(self._loop)
-        # schedule to run when loop starts
-        self._loop.call_soon_threadsafe(self._ready.set)
+        try:
+            asyncio.set_event_loop(self._loop)
+            self._loop_tid = threading.get_ident()
+        except Exception as e:
+            self._ready.set_exception(e)
+            self._loop.close()
+            return
+        # Signal readiness directly rather than through a scheduled callback:
+        # coroutines submitted before run_forever() starts are queued with
+        # call_soon_threadsafe and picked up on the loop's first iteration.
+        self._ready.set_result(None)
         self._loop.run_forever()
 
         # after loop stops,
@@ -67,9 +194,21 @@ class LoopRunner():
     def terminate(self):
         """Gracefully stop the background event loop and terminate the associated thread.
         """
+        if threading.get_ident() == self._loop_tid:
+            # the thread cannot join itself; it exits once the loop stops
+            self._loop.stop()
+            return
         self._loop.call_soon_threadsafe(self._loop.stop)
         self._thread.join(timeout=self.timeout)
 
+    def _call_soon(self, callback: Callable, *args) -> None:
+        """Schedule CALLBACK on the loop, waking it up only if called from
+        another thread; ``call_soon`` suffices on the loop thread itself."""
+        if threading.get_ident() == self._loop_tid:
+            self._loop.call_soon(callback, *args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
     def run(self, coro: Coroutine, timeout: float = 5):
         """Schedule a coroutine to run on the background event loop and wait.
 
@@ -84,40 +223,303 @@ class LoopRunner():
             RuntimeError: If the runner's event loop is not running.
             TimeoutError: If the coroutine does not complete within ``timeout``.
         """
-        if not self._loop.is_running():
-            raise RuntimeError("Event loop is not running")
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if threading.get_ident() == self._loop_tid:
+            coro.close()
+            raise RuntimeError("run() would block the event loop thread; use run_async() instead")
+        future = self.run_nowait(coro)
         try:
             return future.result(timeout)
         except concurrent.futures.TimeoutError:
             raise TimeoutError()
 
+    def run_async(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a coroutine from code already running on the event loop.
+
+        Intended for callbacks executed by the loop itself (e.g. notification
+        handlers), which cannot block on :meth:`run`. The coroutine is
+        scheduled directly on the loop, without the cross-thread hand-off.
+
+        Args:
+            coro: The coroutine object to execute on the runner's event loop.
+
+        Returns:
+            asyncio.Task: Task wrapping the coroutine.
+
+        Raises:
+            RuntimeError: If not called from the runner's event loop thread.
+        """
+        if threading.get_ident() != self._loop_tid:
+            coro.close()
+            raise RuntimeError("run_async() must be called from the event loop thread")
+        return self._loop.create_task(coro)
+
+    def run_nowait(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the background event loop without waiting.
+
+        Args:
+            coro: The coroutine object to execute on the runner's event loop.
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the coroutine's
+            result. Cancelling it cancels the coroutine.
+
+        Raises:
+            RuntimeError: If the runner's event loop is not running.
+        """
+        if self._loop.is_closed() or not self._thread.is_alive():
+            coro.close()
+            raise RuntimeError("Event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def gather(self, coros: Iterable[Coroutine], timeout: float = 5) -> list:
+        """Run several coroutines concurrently and wait for all of them.
+
+        All coroutines are submitted before waiting, so the total wall time is
+        bounded by the slowest one rather than the sum.
+
+        Args:
+            coros: Coroutine objects to execute on the runner's event loop.
+            timeout: Maximum seconds to wait for all coroutines to complete.
+
+        Returns:
+            list: The coroutines' results, in submission order.
+
+        Raises:
+            RuntimeError: If the runner's event loop is not running.
+            TimeoutError: If not all coroutines complete within ``timeout``;
+                unfinished ones are cancelled.
+            Exception: The first exception raised by a coroutine, in
+                submission order.
+        """
+        futures = [self.run_nowait(coro) for coro in coros]
+        _, pending = concurrent.futures.wait(futures, timeout=timeout)
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise TimeoutError()
+        return [future.result() for future in futures]
+
+
+class SyncLoopRunner(BaseLoopRunner):
+    """Run asyncio coroutines on a private event loop in the calling thread.
+
+    Unlike :class:`LoopRunner` no background thread is started: each
+    :meth:`run` drives the loop with ``run_until_complete`` on the caller's
+    thread, which avoids the cross-thread hand-off per operation. This suits
+    scripts issuing BLE operations one after the other. The loop only runs
+    while a call is in progress, so notifications are only delivered during
+    :meth:`run`/:meth:`gather` calls; use :class:`LoopRunner` for
+    applications that need to receive them continuously (e.g. GUIs).
+
+    Calls may come from any thread but are serialized.
+
+    Attributes:
+        timeout (float): Kept for interface compatibility.
+        _loop (asyncio.AbstractEventLoop): The event loop driven by callers.
+        _lock (threading.Lock): Serializes callers driving the loop.
+    """
+
+    def __init__(self, timeout: float = 2.0):
+        """Create the private event loop.
+
+        Args:
+            timeout: Kept for interface compatibility with :class:`LoopRunner`.
+        """
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+
+    def terminate(self):
+        """Close the private event loop."""
+        with self._lock:
+            self._loop.close()
+
+    def run(self, coro: Coroutine, timeout: float = 5):
+        """Run a coroutine on the private event loop until it completes.
+
+        Args:
+            coro: The coroutine object to execute.
+            timeout: Maximum seconds to wait; the coroutine is cancelled
+                when exceeded.
+
+        Returns:
+            The value returned by the coroutine.
+
+        Raises:
+            RuntimeError: If called from a coroutine running on this loop
+                (use :meth:`run_async`), or if the loop is closed.
+            TimeoutError: If the coroutine does not complete within ``timeout``.
+        """
+        if self._loop.is_running() and self._running_here():
+            coro.close()
+            raise RuntimeError("run() would block the event loop thread; use run_async() instead")
+        with self._lock:
+            if self._loop.is_closed():
+                coro.close()
+                raise RuntimeError("Event loop is closed")
+            try:
+                return self._loop.run_until_complete(asyncio.wait_for(coro, timeout))
+            except asyncio.TimeoutError:
+                raise TimeoutError()
+
+    def gather(self, coros: Iterable[Coroutine], timeout: float = 5) -> list:
+        """Run several coroutines concurrently and wait for all of them.
+
+        See :meth:`BaseLoopRunner.gather`.
+        """
+        coros = list(coros)
+
+        async def _all():
+            return await asyncio.gather(*coros)
+
+        return self.run(_all(), timeout)
+
+    def run_async(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a coroutine from code running on the private event loop.
+
+        See :meth:`LoopRunner.run_async`.
+        """
+        if not self._running_here():
+            coro.close()
+            raise RuntimeError("run_async() must be called from the event loop thread")
+        return self._loop.create_task(coro)
+
+    def _running_here(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+class _SharedLoop():
+    """Base class for objects executing their coroutines on the shared loop.
+
+    Unless given a runner explicitly, all instances schedule work on
+    :meth:`LoopRunner.instance`, so a process uses a single background thread
+    regardless of how many scanners and devices it creates.
 
-class Scanner(LoopRunner):
+    Attributes:
+        _runner (BaseLoopRunner): Runner used to execute coroutines.
+    """
+
+    def __init__(self, runner: Optional[BaseLoopRunner] = None):
+        self._runner = runner if runner is not None else LoopRunner.instance()
+
+    def run(self, coro: Coroutine, timeout: float = 5):
+        """Run a coroutine on the shared event loop and wait for its result.
+
+        See :meth:`BaseLoopRunner.run`.
+        """
+        return self._runner.run(coro, timeout)
+
+    def run_async(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a coroutine from code running on the shared event loop.
+
+        See :meth:`BaseLoopRunner.run_async`.
+        """
+        return self._runner.run_async(coro)
+
+    def terminate(self):
+        """Kept for backwards compatibility.
+
+        The shared event loop is used by other objects and is stopped
+        automatically at interpreter exit, so this is a no-op.
+        """
+
+
+@dataclass
+class ScanEntry:
+    """A SmartVNS device found by :class:`Scanner`.
+
+    Attributes:
+        name (str): Advertised device name.
+        address (str): Device identifier, usable to create a
+            :class:`Tracker` or :class:`Stimulator`.
+        rssi (int): Received signal strength of the last advertisement in
+            dBm.
+        device (BLEDevice): Bleak device object.
+        adv (AdvertisementData): Last advertisement received.
+    """
+
+    # no per-instance __dict__; scans may return many entries
+    __slots__ = ("name", "address", "rssi", "device", "adv")
+
+    name: str
+    address: str
+    rssi: int
+    device: BLEDevice
+    adv: AdvertisementData
+
+
+class Scanner(_SharedLoop):
     """
     Scanner class to discover SmartVNS devices via BLE.
     """
 
     # annotation of instance attributes
     devices: dict[str, tuple[BLEDevice, AdvertisementData]]
-    scanner: BleakScanner
+    entries: List[ScanEntry]
+
+    # Bleak scanners shared by all instances with the same runner and service
+    # filter, created on first use
+    _shared_scanners: dict[tuple, BleakScanner] = {}
+    _shared_scanners_lock = threading.Lock()
 
-    def __init__(self):
-        """Initialize the scanner and start the background event loop.
+    def __init__(self,
+                 service_uuids: Optional[List[str]] = None,
+                 runner: Optional[BaseLoopRunner] = None):
+        """Initialize the scanner on the shared background event loop.
+
+        Args:
+            service_uuids: Optional list of service UUIDs advertised by the
+                devices of interest. When given, filtering is delegated to
+                the Bluetooth stack (and, where supported, the controller),
+                so advertisements from other devices never reach Python.
+                Only use UUIDs the firmware actually advertises; devices not
+                advertising them will not be found. The name filter is
+                applied in either case.
+            runner: Runner executing the BLE coroutines. Defaults to the
+                shared :meth:`LoopRunner.instance`. It must be a
+                :class:`LoopRunner`: a :class:`SyncLoopRunner` only runs its
+                loop during calls, so advertisements received between
+                :meth:`start` and :meth:`stop` would not be processed.
 
         Attributes:
             devices (dict): Mapping of device identifier to a tuple of
                 ``(BLEDevice, AdvertisementData)`` containing discovered
-                devices that match the SmartVNS naming filter. Initially an
+                devices whose name starts with ``"SmartVNS"``. Initially an
                 empty dict until ``stop()`` is called.
+            entries (list): The same devices as :class:`ScanEntry` objects,
+                e.g. to sort them by ``rssi``. Initially empty until
+                ``stop()`` is called.
             scanner (BleakScanner): Bleak scanner instance used to perform
-                BLE discovery.
+                BLE discovery. It is created on first access and shared by
+                all scanners using the same runner and ``service_uuids``.
         """
 
-        super().__init__()
+        super().__init__(runner)
 
         self.devices = dict()
-        self.scanner = BleakScanner()
+        self.entries = []
+        self._scanner_key = (
+            self._runner,
+            tuple(service_uuids) if service_uuids is not None else None,
+        )
+
+    @property
+    def scanner(self) -> BleakScanner:
+        """Bleak scanner used by this instance, created on first access."""
+        scanner = Scanner._shared_scanners.get(self._scanner_key)
+        if scanner is None:
+            with Scanner._shared_scanners_lock:
+                scanner = Scanner._shared_scanners.get(self._scanner_key)
+                if scanner is None:
+                    service_uuids = self._scanner_key[1]
+                    scanner = BleakScanner(
+                        service_uuids=list(service_uuids) if service_uuids is not None else None,
+                    )
+                    Scanner._shared_scanners[self._scanner_key] = scanner
+        return scanner
 
     def start(self) -> None:
         """
@@ -139,7 +541,7 @@ class Scanner(LoopRunner):
         """Stop the Bleak scanner and update ``self.devices``.
 
         The resulting scanned SmartVNS devices are stored in the `devices`
-        attribute.
+        and `entries` attributes.
 
         Returns:
             None
@@ -149,12 +551,13 @@ class Scanner(LoopRunner):
             self.scanner.stop(),
         )
 
-        self.devices = self._filter_devices(
+        self.entries = self._filter_devices(
             self.scanner.discovered_devices_and_advertisement_data
         )
+        self.devices = {e.address: (e.device, e.adv) for e in self.entries}
 
     @staticmethod
-    def _filter_devices(devices: dict[str, tuple[BLEDevice, AdvertisementData]]) -> dict[str, tuple[BLEDevice, AdvertisementData]]:
+    def _filter_devices(devices: dict[str, tuple[BLEDevice, AdvertisementData]]) -> List[ScanEntry]:
         """Filter discovered BLE devices for SmartVNS devices.
 
         Args:
@@ -162,72 +565,142 @@ class Scanner(LoopRunner):
                 keys and values as ``(BLEDevice, AdvertisementData)`` tuples.
 
         Returns:
-            A new dict containing only the items where the BLEDevice has a
-            non-empty ``name`` and the substring ``"SmartVNS"`` appears in
-            that name.
+            A list of entries for the devices whose ``name`` starts with
+            ``"SmartVNS"``.
         """
 
-        filtered: dict[str, tuple[BLEDevice, AdvertisementData]] = {k: v for k, v in devices.items()
-                                    if v[0].name and "SmartVNS" in v[0].name}
-        return filtered
+        return [
+            ScanEntry(name, address, adv.rssi, dev, adv)
+            for address, (dev, adv) in devices.items()
+            if (name := dev.name) is not None and name.startswith(_NAME_PREFIX)
+        ]
 
 
-class VNSDevice(LoopRunner):
+class VNSDevice(_SharedLoop):
     """Base class for SmartVNS BLE devices.
 
-    This class provides a thread-backed asyncio event loop (via
-    :class:`LoopRunner`) and an associated :class:`BleakClient` instance used
+    This class provides access to the shared thread-backed asyncio event loop
+    (via :meth:`LoopRunner.instance`) and an associated :class:`BleakClient` instance used
     to perform BLE operations. Concrete device classes (for example,
     ``Tracker`` and ``Stimulator``) inherit from this class.
 
     Attributes:
         device (str | BLEDevice): Address string or BleakDevice instance used
             to construct the underlying BleakClient.
-        _client (BleakClient): Bleak client bound to ``device`` used for
-            asynchronous BLE operations.
+        _client (BleakClient | None): Bleak client bound to ``device`` used
+            for asynchronous BLE operations. Created on first use by
+            :meth:`_ensure_client`.
+        _chars (dict): Characteristics of the connected device keyed by
+            UUID, resolved from ``_services`` by :meth:`connect`.
+        _services (BleakGATTServiceCollection | None): Services of the last
+            connection. Kept across reconnects, so the characteristics are
+            only resolved again if Bleak discovered the services anew.
+
+    Create one device object per physical device and use :meth:`reconnect`
+    after a connection loss, rather than a new object: the Bleak client and
+    the caches of the backend and of this object are then reused.
     """
 
-    def __init__(self, device: Union[str, BLEDevice]):
-        """Initialize the event loop runner and Bleak client.
+    def __init__(self,
+                 device: Union[str, BLEDevice],
+                 runner: Optional[BaseLoopRunner] = None):
+        """Attach to the shared event loop runner and create the Bleak client.
 
         Args:
             device: A device identifier (address string) or a
                 :class:`BLEDevice` instance. The value is passed to
                 :class:`BleakClient` to create a client bound to the
-                target device.
+                target device when it is first needed.
+            runner: Runner executing the BLE coroutines. Defaults to the
+                shared :meth:`LoopRunner.instance`; pass e.g. a
+                :class:`SyncLoopRunner` to run them on the calling thread.
         """
-        super().__init__()
+        super().__init__(runner)
 
         self.device = device
-        self._client = BleakClient(device)
+        self._client: Optional[BleakClient] = None
+        self._chars: dict = {}
+        self._services = None
+
+    def _ensure_client(self) -> BleakClient:
+        """Return the Bleak client of this device, creating it on first use.
+
+        Deferring construction avoids setting up backend resources for device
+        objects that are never connected.
+        """
+        if self._client is None:
+            self._client = BleakClient(self.device)
+        return self._client
+
+    def _char(self, uuid: str) -> Char:
+        """Return the resolved characteristic for UUID, or UUID itself if it
+        has not been resolved."""
+        return self._chars.get(uuid, uuid)
 
     def connect(self,
                 retries: int = 3,
                 timeout: float = 5.0) -> None:
         """Connect to the target device, retrying on failure.
 
-        This method schedules the asynchronous ``connect_async`` routine on
-        the background event loop and will attempt the connection up to
-        ``retries`` times. A conservative per-call timeout is computed from
-        ``timeout`` and ``retries`` to give the async routine sufficient time
-        to complete across attempts.
+        This method schedules :func:`connect_with_retries_async` once on the
+        background event loop. Each attempt is bounded by ``timeout`` and
+        failed attempts are retried with an exponential backoff, up to
+        ``retries`` attempts in total. Nothing is scheduled if the client is
+        already connected.
 
         Args:
             retries: Number of connection attempts (default: 3).
             timeout: Timeout in seconds for each attempt (default: 5.0).
 
         Raises:
-            TimeoutError: If the underlying asyncio call times out.
+            BleakError: If the last connection attempt failed.
+            TimeoutError: If the last attempt or the underlying asyncio call
+                times out.
             RuntimeError: If the event loop is not running (propagated from
                 :meth:`LoopRunner.run`).
         """
 
-        run_timeout = timeout * retries + 1
-        for _ in range(retries):
-            self.run(
-                connect_async(self._client),
-                timeout=run_timeout
-            )
+        if self._client is not None and self._client.is_connected:
+            return
+
+        self.run(
+            self._connect_async(retries, timeout),
+            timeout=_connect_run_timeout(retries, timeout)
+        )
+
+    async def _connect_async(self, retries: int, timeout: float) -> None:
+        """Connect the client and set up the per-connection state."""
+        client = self._ensure_client()
+        await connect_with_retries_async(client, retries, timeout)
+        if client.services is not self._services:
+            self._services = client.services
+            self._chars = resolve_characteristics(client)
+
+    def reconnect(self,
+                  retries: int = 3,
+                  timeout: float = 5.0) -> None:
+        """Disconnect if connected, then connect again with the same client.
+
+        Args:
+            retries: Number of connection attempts (default: 3).
+            timeout: Timeout in seconds for the disconnect and for each
+                connection attempt (default: 5.0).
+
+        Raises:
+            BleakError: If the last connection attempt failed.
+            TimeoutError: If the last attempt or the underlying asyncio call
+                times out.
+        """
+        self.run(
+            self._reconnect_async(retries, timeout),
+            timeout=_connect_run_timeout(retries, timeout) + timeout
+        )
+
+    async def _reconnect_async(self, retries: int, timeout: float) -> None:
+        client = self._ensure_client()
+        if client.is_connected:
+            await asyncio.wait_for(disconnect_async(client), timeout)
+        await self._connect_async(retries, timeout)
 
     def disconnect(self, timeout: float = 5.0) -> None:
         """Disconnect the Bleak client from the device.
@@ -238,6 +711,8 @@ class VNSDevice(LoopRunner):
         Raises:
             TimeoutError: If the underlying asyncio call times out.
         """
+        if self._client is None:
+            return
         self.run(
             disconnect_async(self._client),
             timeout=timeout
@@ -249,23 +724,33 @@ class Tracker(VNSDevice):
     Tracker device class to handle SmartVNS Tracker specific operations.
     """
 
-    def __init__(self, device: Union[str, BLEDevice]):
-        super().__init__(device)
+    def __init__(self,
+                 device: Union[str, BLEDevice],
+                 runner: Optional[BaseLoopRunner] = None):
+        super().__init__(device, runner)
 
-    def get_sys_config(self, timeout: float = 5.0) -> SysConfig:
+    def get_sys_config(self, timeout: float = 5.0,
+                       cfg: Optional[SysConfig] = None) -> SysConfig:
         """Retrieve the system configuration from the device.
 
         Args:
             timeout (float): Timeout for the operation in seconds.
+            cfg (SysConfig): Optional message to parse into instead of a new
+                one, e.g. one reused across polls. Its previous content is
+                cleared.
 
         Returns:
-            SysConfig: The system configuration retrieved from the device.
+            SysConfig: The system configuration retrieved from the device
+            (``cfg`` if provided).
         """
         return self.run(
-            read_sys_config_async(self._client),
+            self._read_sys_config_async(cfg),
             timeout=timeout
         )
 
+    def _read_sys_config_async(self, cfg: Optional[SysConfig] = None) -> Coroutine:
+        return read_sys_config_async(self._ensure_client(), cfg, self._char(SYS_CHAR))
+
     def set_sys_config(self,
                        cfg: SysConfig,
                        timeout: float = 5.0) -> None:
@@ -279,13 +764,14 @@ class Tracker(VNSDevice):
             None
         """
         return self.run(
-            write_sys_config_async(self._client, cfg),
+            write_sys_config_async(self._ensure_client(), cfg, self._char(SYS_CHAR)),
             timeout=timeout
         )
 
     def start_notification(self,
                            handler: Callable[[bytearray], None],
-                           timeout: float = 5.0) -> None:
+                           timeout: float = 5.0,
+                           zero_copy: bool = False) -> None:
         """
         Start notifications from the device with a custom handler.
         The handler function signature should be:
@@ -298,6 +784,10 @@ class Tracker(VNSDevice):
             handler (Callable[[bytearray], None]): A callback function to
                 handle incoming notification data.
             timeout (float): Timeout for the operation in seconds.
+            zero_copy (bool): Pass the handler a :class:`memoryview` of the
+                data instead, so it can be sliced (e.g. to parse a header)
+                without copying. The view is only valid during the call;
+                copy what must be kept, e.g. with ``bytes(view)``.
 
         Returns:
             None
@@ -306,12 +796,37 @@ class Tracker(VNSDevice):
         if handler is None:
             raise ValueError("Handler function must be provided")
 
-        # sender is known, no need to expose to user
-        def _handler(_, data):
-            handler(data)
+        return self.start_notification_raw(
+            functools.partial(_forward_view if zero_copy else _forward, handler),
+            timeout=timeout
+        )
+
+    def start_notification_raw(self,
+                               handler: Callable[[object, bytearray], None],
+                               timeout: float = 5.0) -> None:
+        """
+        Start notifications from the device, passing the handler to Bleak as is.
+        The handler function signature should be:
+            handler(sender: BleakGATTCharacteristic, data: bytearray) -> None
+
+        Unlike :meth:`start_notification`, no adapter is placed between Bleak
+        and the handler, which saves a function call per notification when
+        streaming at high rates.
+
+        Args:
+            handler (Callable[[object, bytearray], None]): A callback function
+                accepting the sender and the incoming notification data.
+            timeout (float): Timeout for the operation in seconds.
+
+        Returns:
+            None
+        """
+
+        if handler is None:
+            raise ValueError("Handler function must be provided")
 
         return self.run(
-            start_notification_async(self._client, _handler),
+            start_notification_async(self._ensure_client(), handler, self._char(DATA_UUID)),
             timeout=timeout
         )
 
@@ -328,7 +843,7 @@ class Tracker(VNSDevice):
         """
 
         return self.run(
-            stop_notification_async(self._client),
+            stop_notification_async(self._ensure_client(), self._char(DATA_UUID)),
             timeout=timeout
         )
 
@@ -341,23 +856,104 @@ class Stimulator(Tracker):
     to System Configuration and Notification handling as the Tracker device.
     """
 
-    def __init__(self, device: Union[str, BLEDevice]):
-        super().__init__(device)
+    def __init__(self,
+                 device: Union[str, BLEDevice],
+                 runner: Optional[BaseLoopRunner] = None,
+                 coalesce_window: float = 0.0):
+        """Initialize the stimulator.
+
+        Args:
+            device: Address string or :class:`BLEDevice` of the stimulator.
+            runner: Runner executing the BLE coroutines, see
+                :class:`VNSDevice`.
+            coalesce_window: If greater than zero, :meth:`increase_intensity`
+                and :meth:`decrease_intensity` return immediately; once no
+                further step was requested for this many seconds, the net
+                number of steps is sent from the runner's loop, one Write
+                Command per step. Call :meth:`flush_intensity` to send
+                pending steps right away. Requires a :class:`LoopRunner`.
+
+        Raises:
+            ValueError: If ``coalesce_window`` is set with a runner that has
+                no background loop (:class:`SyncLoopRunner`).
+        """
+        super().__init__(device, runner)
+        if coalesce_window > 0 and not isinstance(self._runner, LoopRunner):
+            raise ValueError("coalesce_window requires a runner with a background loop")
+
+        # last configuration read from / written to the device
+        self._stim_cfg_cache: Optional[StimConfig] = None
+
+        self._coalesce_window = coalesce_window
+        self._pending_steps = 0
+        self._steps_lock = threading.Lock()
+        # only used on the loop thread: the pending window and the flush
+        # started when it expired, if still sending
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # error of the last flush sent once the window expired, raised by the
+        # next call queueing or flushing steps
+        self._flush_error: Optional[BaseException] = None
+
+    def _cache_stim_config(self, cfg: StimConfig) -> None:
+        # CFG is owned by the caller: cache a copy
+        cached = StimConfig()
+        cached.CopyFrom(cfg)
+        self._stim_cfg_cache = cached
+
+    def invalidate_stim_cache(self) -> None:
+        """Forget the cached stimulation configuration.
+
+        Call this if the configuration was changed on the device by other
+        means (e.g. over USB), so the next :meth:`trigger` reads it again.
+        """
+        self._stim_cfg_cache = None
+
+    def connect(self,
+                retries: int = 3,
+                timeout: float = 5.0) -> None:
+        """Connect to the device and read its stimulation configuration.
+
+        The configuration is cached so that :meth:`trigger` needs a single
+        write; it is only read if not cached yet. See
+        :meth:`VNSDevice.connect` for the retry behaviour.
+
+        Args:
+            retries: Number of connection attempts (default: 3).
+            timeout: Timeout in seconds for each attempt and for reading
+                the configuration (default: 5.0).
+        """
+        super().connect(retries=retries, timeout=timeout)
+
+    async def _connect_async(self, retries: int, timeout: float) -> None:
+        await super()._connect_async(retries, timeout)
+        if self._stim_cfg_cache is None:
+            # the message read is not handed out: cache it as is
+            self._stim_cfg_cache = await asyncio.wait_for(
+                read_stim_config_async(self._client, char=self._char(STIM_CHAR)),
+                timeout
+            )
 
-    def get_stim_config(self, timeout: float = 5.0) -> StimConfig:
+    def get_stim_config(self, timeout: float = 5.0,
+                        cfg: Optional[StimConfig] = None) -> StimConfig:
         """
         Retrieve the stimulation configuration from the device.
 
         Args:
             timeout (float): Timeout for the operation in seconds.
+            cfg (StimConfig): Optional message to parse into instead of a new
+                one, see :meth:`Tracker.get_sys_config`.
 
         Returns:
-            StimConfig: The stimulation configuration retrieved from the device.
+            StimConfig: The stimulation configuration retrieved from the
+            device (``cfg`` if provided).
         """
-        return self.run(
-            read_stim_config_async(self._client),
+        cfg = self.run(
+            read_stim_config_async(self._ensure_client(), cfg, self._char(STIM_CHAR)),
             timeout=timeout
         )
+        self._cache_stim_config(cfg)
+        return cfg
 
     def set_stim_config(self,
                         cfg: StimConfig,
@@ -372,23 +968,34 @@ class Stimulator(Tracker):
         Returns:
             None
         """
-        return self.run(
-            write_stim_config_async(self._client, cfg),
+        self.run(
+            write_stim_config_async(self._ensure_client(), cfg, self._char(STIM_CHAR)),
             timeout=timeout
         )
+        self._cache_stim_config(cfg)
 
     def increase_intensity(self, timeout: float = 5.0) -> None:
         """
         Increase the stimulation intensity on the device.
 
+        With a ``coalesce_window`` the step is queued instead, see
+        :meth:`__init__`.
+
         Args:
             timeout (float): Timeout for the operation in seconds.
 
         Returns:
             None
+
+        Raises:
+            Exception: With a ``coalesce_window``, the error that prevented
+                previously queued steps from being sent. Those steps stay
+                queued; this step is not.
         """
+        if self._coalesce_window > 0:
+            return self._queue_intensity_steps(1)
         return self.run(
-            increase_stim_intensity_async(self._client),
+            increase_stim_intensity_async(self._ensure_client(), char=self._char(STIM_CHAR)),
             timeout=timeout
         )
 
@@ -396,29 +1003,220 @@ class Stimulator(Tracker):
         """
         Decrease the stimulation intensity on the device.
 
+        With a ``coalesce_window`` the step is queued instead, see
+        :meth:`increase_intensity`.
+
         Args:
             timeout (float): Timeout for the operation in seconds.
 
         Returns:
             None
         """
+        if self._coalesce_window > 0:
+            return self._queue_intensity_steps(-1)
         return self.run(
-            decrease_stim_intensity_async(self._client),
+            decrease_stim_intensity_async(self._ensure_client(), char=self._char(STIM_CHAR)),
             timeout=timeout
         )
 
+    def _queue_intensity_steps(self, steps: int) -> None:
+        with self._steps_lock:
+            error, self._flush_error = self._flush_error, None
+            if error is None:
+                self._pending_steps += steps
+        if error is not None:
+            raise error
+        self._runner._call_soon(self._restart_flush_timer)
+
+    def _restart_flush_timer(self) -> None:
+        # runs on the loop: the window restarts with every queued step
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = asyncio.get_running_loop().call_later(
+            self._coalesce_window, self._flush_expired)
+
+    def _flush_expired(self) -> None:
+        self._flush_handle = None
+        with self._steps_lock:
+            steps, self._pending_steps = self._pending_steps, 0
+        if steps:
+            self._flush_task = asyncio.get_running_loop().create_task(self._send_steps_async(steps))
+            self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        if self._flush_task is task:
+            self._flush_task = None
+        if task.cancelled() or task.exception() is None:
+            return
+        _log.warning(f"Failed to send intensity steps to {self.device}: {task.exception()!r}")
+        with self._steps_lock:
+            self._flush_error = task.exception()
+
+    async def _send_steps_async(self, steps: int) -> None:
+        """Send STEPS intensity steps, queueing the unsent ones again on failure."""
+        step = 1 if steps > 0 else -1
+        try:
+            client = self._ensure_client()
+            while steps:
+                await step_stim_intensity_async(client, step, self._char(STIM_CHAR))
+                steps -= step
+        except BaseException:
+            with self._steps_lock:
+                self._pending_steps += steps
+            raise
+
+    def flush_intensity(self, timeout: float = 5.0) -> None:
+        """
+        Send the intensity steps queued with a ``coalesce_window`` now.
+
+        Opposite steps cancel out; the net steps are sent back-to-back, one
+        Write Command per step. Returns once all of them were sent, including
+        those of a flush already started because the window expired. Steps
+        that could not be sent stay queued.
+
+        Args:
+            timeout (float): Timeout for the operation in seconds.
+
+        Returns:
+            None
+        """
+        if self._coalesce_window > 0:
+            self.run(self._flush_async(), timeout=timeout)
+
+    async def _flush_async(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            # its unsent steps are queued again if it fails
+            await asyncio.wait({self._flush_task})
+        with self._steps_lock:
+            steps, self._pending_steps = self._pending_steps, 0
+            # steps of a failed flush were queued again and are sent now
+            self._flush_error = None
+        if steps:
+            await self._send_steps_async(steps)
+
     def trigger(self, duration_ms: int,
                 timeout: float = 5.0) -> None:
         """
         Trigger a stimulation pulse for a specified duration.
 
+        The pulse is sent as a stimulation configuration update based on the
+        last configuration read from or written to the device (cached on
+        :meth:`connect`), so normally a single write is needed. The ``Stim``
+        command has no trigger-only variant, hence the whole configuration
+        is written. If nothing is cached, the configuration is read first,
+        in the same operation.
+
         Args:
             duration_ms (int): Duration of the stimulation pulse in milliseconds.
-            timeout (float): Timeout for the operation in seconds.
+            timeout (float): Timeout for the operation in seconds; doubled
+                if the configuration must be read first.
 
         Returns:
             None
         """
-        cfg = self.get_stim_config()
-        cfg.trigger_ms = duration_ms
-        return self.set_stim_config(cfg, timeout=timeout)
+        self.run(
+            self._trigger_async(duration_ms),
+            timeout=timeout if self._stim_cfg_cache is not None else 2 * timeout
+        )
+
+    async def _trigger_async(self, duration_ms: int) -> None:
+        client = self._ensure_client()
+        if self._stim_cfg_cache is None:
+            self._stim_cfg_cache = await read_stim_config_async(
+                client, char=self._char(STIM_CHAR))
+        await trigger_async(client, self._stim_cfg_cache, duration_ms, self._char(STIM_CHAR))
+
+    def disconnect(self, timeout: float = 5.0) -> None:
+        """Disconnect from the device and drop the cached stimulation configuration.
+
+        Intensity steps still queued with a ``coalesce_window`` are sent first
+        if the device is connected. The device is disconnected even if
+        sending them fails.
+
+        Args:
+            timeout: Timeout in seconds for the disconnect operation.
+
+        Raises:
+            TimeoutError: If the underlying asyncio call times out.
+        """
+        try:
+            if self._client is not None and self._client.is_connected:
+                self.flush_intensity(timeout=timeout)
+        finally:
+            self.invalidate_stim_cache()
+            super().disconnect(timeout=timeout)
+
+    def reconnect(self,
+                  retries: int = 3,
+                  timeout: float = 5.0) -> None:
+        """Reconnect and read the stimulation configuration again.
+
+        Intensity steps still queued with a ``coalesce_window`` are sent
+        first if the device is connected. See :meth:`VNSDevice.reconnect`.
+        """
+        if self._client is not None and self._client.is_connected:
+            self.flush_intensity(timeout=timeout)
+        self.invalidate_stim_cache()
+        super().reconnect(retries=retries, timeout=timeout)
+
+
+def _gather_by_runner(jobs: List[tuple], timeout: float) -> list:
+    """Run ``(runner, coroutine)`` JOBS concurrently on their runners.
+
+    Returns:
+        list: The coroutines' results, in the order of JOBS.
+    """
+    groups: dict[BaseLoopRunner, List[int]] = {}
+    for i, (runner, _) in enumerate(jobs):
+        groups.setdefault(runner, []).append(i)
+
+    results = [None] * len(jobs)
+    for runner, indices in groups.items():
+        values = runner.gather((jobs[i][1] for i in indices), timeout=timeout)
+        for i, value in zip(indices, values):
+            results[i] = value
+    return results
+
+
+def connect_many(devices: Iterable[VNSDevice],
+                 retries: int = 3,
+                 timeout: float = 5.0) -> None:
+    """Connect several devices concurrently.
+
+    Equivalent to calling :meth:`VNSDevice.connect` on every device, but all
+    connections sharing a runner are established at the same time, so the
+    total time is about that of the slowest device rather than the sum.
+
+    Args:
+        devices: Devices to connect. Already connected ones are skipped.
+        retries: Number of connection attempts per device (default: 3).
+        timeout: Timeout in seconds for each attempt (default: 5.0).
+
+    Raises:
+        BleakError: If the last connection attempt of a device failed.
+        TimeoutError: If not all devices are connected in time.
+    """
+    jobs = [
+        (device._runner, device._connect_async(retries, timeout))
+        for device in devices
+        if device._client is None or not device._client.is_connected
+    ]
+    _gather_by_runner(jobs, _connect_run_timeout(retries, timeout))
+
+
+def read_sys_config_many(trackers: Iterable[Tracker],
+                         timeout: float = 5.0) -> List[SysConfig]:
+    """Read the system configuration of several devices concurrently.
+
+    Args:
+        trackers: Connected trackers or stimulators.
+        timeout: Timeout for the operation in seconds.
+
+    Returns:
+        list: The system configurations, in the order of ``trackers``.
+    """
+    jobs = [(tracker._runner, tracker._read_sys_config_async()) for tracker in trackers]
+    return _gather_by_runner(jobs, timeout)
@@ -5,8 +5,12 @@ configurations, control stimulation commands and manage notifications.
 It is user's responsibility to use these functions with the correct device
 client.
 """
-from typing import Callable
+import asyncio
+from typing import Callable, Optional, Union
 from bleak import BleakClient
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.exc import BleakError
+from google.protobuf.internal import api_implementation
 
 from smartvns.config import SysConfig, StimConfig
 from ..config.proto.generated.python.smartvns_pb2 import Stim, Empty
@@ -17,6 +21,21 @@ STIM_CHAR = "CE60014E-AE91-11e1-4496-9FC5DD4AFF01"
 DATA_UUID = "ce60014d-ae91-11e1-4495-9fc5dd4aff08"
 BATTERY_UUID = "2a19"
 
+# delay in seconds before the second connection attempt, doubled afterwards
+CONNECT_BACKOFF = 0.2
+
+# characteristic specifier: UUID string or the resolved characteristic object
+Char = Union[str, BleakGATTCharacteristic]
+
+# The pure-Python protobuf backend takes long enough on larger messages to
+# delay notifications; move such messages off the loop thread. The C/upb
+# backends are faster than the hand-off to the executor.
+_OFFLOAD_MIN_BYTES = 256 if api_implementation.Type() == "python" else None
+
+# payload-less commands, serialized once
+_INCREASE_BYTES = Stim(int_increase=Empty()).SerializeToString()
+_DECREASE_BYTES = Stim(int_decrease=Empty()).SerializeToString()
+
 
 async def connect_async(client: BleakClient) -> None:
     """Connect the BLE client asynchronously.
@@ -31,6 +50,93 @@ async def connect_async(client: BleakClient) -> None:
     return await client.connect()
 
 
+async def connect_with_retries_async(
+        client: BleakClient,
+        retries: int = 3,
+        timeout: float = 5.0,
+        backoff: float = CONNECT_BACKOFF) -> None:
+    """Connect the BLE client, retrying failed attempts with exponential backoff.
+
+    Returns immediately if the client is already connected.
+
+    Args:
+        client: BleakClient to connect.
+        retries: Maximum number of connection attempts.
+        timeout: Timeout in seconds for each attempt.
+        backoff: Delay in seconds before the second attempt; doubled after
+            every further failure.
+
+    Raises:
+        BleakError: If the last attempt failed with a Bleak error.
+        asyncio.TimeoutError: If the last attempt timed out.
+    """
+
+    if client.is_connected:
+        return
+
+    for attempt in range(retries):
+        try:
+            await asyncio.wait_for(client.connect(), timeout)
+            return
+        except (BleakError, asyncio.TimeoutError):
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+
+def resolve_characteristics(client: BleakClient) -> dict[str, BleakGATTCharacteristic]:
+    """Look up the SmartVNS characteristics of a connected client.
+
+    Passing the returned objects as ``char`` to the routines below saves
+    Bleak a lookup by UUID on every read and write.
+
+    Args:
+        client: Connected BleakClient.
+
+    Returns:
+        dict: Mapping of :data:`SYS_CHAR`, :data:`STIM_CHAR` and
+        :data:`DATA_UUID` to their characteristic objects. UUIDs the device
+        does not expose are left out.
+    """
+
+    chars = {}
+    for uuid in (SYS_CHAR, STIM_CHAR, DATA_UUID):
+        char = client.services.get_characteristic(uuid)
+        if char is not None:
+            chars[uuid] = char
+    return chars
+
+
+async def _parse_async(cfg, data: bytes) -> None:
+    """Parse DATA into CFG, in the default executor if it is large."""
+    if _OFFLOAD_MIN_BYTES is None or len(data) < _OFFLOAD_MIN_BYTES:
+        cfg.ParseFromString(data)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, cfg.ParseFromString, data)
+
+
+async def _serialize_async(msg) -> bytes:
+    """Serialize MSG, in the default executor if it is large."""
+    # only the python backend is slow enough to offload; there ByteSize()
+    # also fills the cached sizes the serializer reuses
+    if _OFFLOAD_MIN_BYTES is None or msg.ByteSize() < _OFFLOAD_MIN_BYTES:
+        return msg.SerializeToString()
+    return await asyncio.get_running_loop().run_in_executor(None, msg.SerializeToString)
+
+
+def connect_with_retries_duration(
+        retries: int = 3,
+        timeout: float = 5.0,
+        backoff: float = CONNECT_BACKOFF) -> float:
+    """Return the longest time :func:`connect_with_retries_async` can take.
+
+    This is the time of all attempts timing out plus the backoff delays in
+    between, e.g. to bound a wait for the connection from another thread.
+    """
+
+    return timeout * retries + backoff * (2 ** max(retries - 1, 0) - 1)
+
+
 async def disconnect_async(client: BleakClient) -> None:
     """Disconnect the BLE client asynchronously if connected.
 
@@ -45,117 +151,208 @@ async def disconnect_async(client: BleakClient) -> None:
 
 
 async def read_sys_config_async(
-        client: BleakClient) -> SysConfig:
+        client: BleakClient,
+        cfg: Optional[SysConfig] = None,
+        char: Char = SYS_CHAR) -> SysConfig:
     """Read and parse the system configuration message from the device.
 
     Args:
         client: BleakClient of the connected device.
+        cfg: Optional message to parse into, e.g. one reused across polls to
+            avoid allocating a new message per read. Its previous content is
+            cleared.
+        char: System configuration characteristic, see
+            :func:`resolve_characteristics`.
 
     Returns:
-        SysConfig: Deserialized system configuration message.
+        SysConfig: Deserialized system configuration message (``cfg`` if
+        provided).
     """
 
-    data = await client.read_gatt_char(SYS_CHAR)
+    data = await client.read_gatt_char(char)
 
-    cfg = SysConfig()
-    cfg.ParseFromString(data)
+    if cfg is None:
+        cfg = SysConfig()
+    await _parse_async(cfg, data)
 
     return cfg
 
 
 async def write_sys_config_async(
         client: BleakClient,
-        cfg: SysConfig) -> None:
+        cfg: SysConfig,
+        char: Char = SYS_CHAR) -> None:
     """Write the system configuration message to the device.
 
     Args:
         client: BleakClient of the connected device.
         cfg: The system configuration message to be sent to the device.
+        char: System configuration characteristic, see
+            :func:`resolve_characteristics`.
     """
 
-    data = cfg.SerializeToString()
-    await client.write_gatt_char(SYS_CHAR, data, response=True)
+    data = await _serialize_async(cfg)
+    await client.write_gatt_char(char, data, response=True)
 
 
 async def read_stim_config_async(
-        client: BleakClient) -> StimConfig:
+        client: BleakClient,
+        cfg: Optional[StimConfig] = None,
+        char: Char = STIM_CHAR) -> StimConfig:
     """Read and parse the stimulation configuration message from the device.
 
     Args:
         client: BleakClient of the connected device.
+        cfg: Optional message to parse into, e.g. one reused across polls to
+            avoid allocating a new message per read. Its previous content is
+            cleared.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
 
     Returns:
-        StimConfig: Deserialized stimulation configuration message.
+        StimConfig: Deserialized stimulation configuration message (``cfg``
+        if provided).
     """
 
-    data = await client.read_gatt_char(STIM_CHAR)
+    data = await client.read_gatt_char(char)
 
-    cfg = StimConfig()
-    cfg.ParseFromString(data)
+    if cfg is None:
+        cfg = StimConfig()
+    await _parse_async(cfg, data)
     return cfg
 
 
 async def write_stim_config_async(
         client: BleakClient,
-        cfg: StimConfig) -> None:
+        cfg: StimConfig,
+        char: Char = STIM_CHAR) -> None:
     """Write the stimulation configuration message to the device.
 
     Args:
         client: BleakClient of the connected device.
         cfg: The stimulation configuration message to be sent to the device.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
+    """
+
+    data = await _serialize_async(Stim(config=cfg))
+    await client.write_gatt_char(char, data, response=True)
+
+
+async def trigger_async(
+        client: BleakClient,
+        cfg: StimConfig,
+        duration_ms: int,
+        char: Char = STIM_CHAR) -> None:
+    """Trigger a stimulation pulse with a single configuration write.
+
+    ``cfg.trigger_ms`` is set to ``duration_ms`` and ``cfg`` is written to the
+    device; nothing is read from it. ``cfg`` should be the current
+    configuration of the device (e.g. the last one read or written), since
+    the whole message is sent and all of its fields are required.
+
+    Args:
+        client: BleakClient of the connected device.
+        cfg: Current stimulation configuration of the device. Modified in
+            place.
+        duration_ms: Duration of the stimulation pulse in milliseconds.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
     """
 
-    cmd = Stim(config=cfg)
-    data = cmd.SerializeToString()
-    await client.write_gatt_char(STIM_CHAR, data, response=True)
+    cfg.trigger_ms = duration_ms
+    await write_stim_config_async(client, cfg, char)
 
 
 async def increase_stim_intensity_async(
-        client: BleakClient) -> None:
+        client: BleakClient,
+        response: bool = False,
+        char: Char = STIM_CHAR) -> None:
     """Send a command to increase the stimulation intensity on the device.
 
+    By default the command is sent as a GATT Write Command (write without
+    response), which saves a round-trip per step and lets consecutive steps
+    share a connection event. The device must accept Write Commands on the
+    stimulation characteristic; ordering is preserved by the GATT queue.
+
     Args:
         client: BleakClient of the connected device.
+        response: Send a Write Request and wait for the device's
+            acknowledgement instead.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
     """
 
-    cmd = Stim(int_increase=Empty())
-    data = cmd.SerializeToString()
-    await client.write_gatt_char(STIM_CHAR, data, response=True)
+    await client.write_gatt_char(char, _INCREASE_BYTES, response=response)
 
 
 async def decrease_stim_intensity_async(
-        client: BleakClient) -> None:
+        client: BleakClient,
+        response: bool = False,
+        char: Char = STIM_CHAR) -> None:
     """Send a command to decrease the stimulation intensity on the device.
 
+    By default the command is sent as a GATT Write Command (write without
+    response), which saves a round-trip per step and lets consecutive steps
+    share a connection event. The device must accept Write Commands on the
+    stimulation characteristic; ordering is preserved by the GATT queue.
+
+    Args:
+        client: BleakClient of the connected device.
+        response: Send a Write Request and wait for the device's
+            acknowledgement instead.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
+    """
+
+    await client.write_gatt_char(char, _DECREASE_BYTES, response=response)
+
+
+async def step_stim_intensity_async(
+        client: BleakClient,
+        steps: int,
+        char: Char = STIM_CHAR) -> None:
+    """Change the stimulation intensity by a number of steps.
+
+    Sends ``abs(steps)`` increase commands (``steps > 0``) or decrease
+    commands (``steps < 0``) back-to-back as Write Commands.
+
     Args:
         client: BleakClient of the connected device.
+        steps: Signed number of intensity steps.
+        char: Stimulation characteristic, see
+            :func:`resolve_characteristics`.
     """
 
-    cmd = Stim(int_decrease=Empty())
-    data = cmd.SerializeToString()
-    await client.write_gatt_char(STIM_CHAR, data, response=True)
+    data = _INCREASE_BYTES if steps > 0 else _DECREASE_BYTES
+    for _ in range(abs(steps)):
+        await client.write_gatt_char(char, data, response=False)
 
 
 async def start_notification_async(
         client: BleakClient,
-        handler: Callable) -> None:
+        handler: Callable,
+        char: Char = DATA_UUID) -> None:
     """Start notifications on the data characteristic with a handler.
 
     Args:
         client: BleakClient of the connected device.
         handler: Callable invoked for incoming notifications. Handler should
             accept the parameters provided by Bleak (sender, data).
+        char: Data characteristic, see :func:`resolve_characteristics`.
     """
 
-    await client.start_notify(DATA_UUID, handler)
+    await client.start_notify(char, handler)
 
 
 async def stop_notification_async(
-        client: BleakClient) -> None:
+        client: BleakClient,
+        char: Char = DATA_UUID) -> None:
     """Stop notifications on the data characteristic.
 
     Args:
         client: BleakClient of the connected device.
+        char: Data characteristic, see :func:`resolve_characteristics`.
     """
 
-    await client.stop_notify(DATA_UUID)
+    await client.stop_notify(char)